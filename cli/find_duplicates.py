@@ -3,25 +3,16 @@ CLI Interface for Duplicate File Finder
 Command: python find_duplicates.py
 """
 import sys
-import json
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from scanner import find_duplicates, count_duplicates, calculate_wasted_space
+from scanner import summarize_index
+from scanner.human import format_size
 import config
 
 
-def format_size(size_bytes: int) -> str:
-    """Format file size in human-readable format."""
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.2f} PB"
-
-
 def main():
     """Main function to run the duplicate finder."""
     
@@ -30,44 +21,36 @@ def main():
     print(" SmartStorage - Duplicate File Finder")
     print("="*60)
     
-    # Load file index
+    # Stream the index shards and analyze them in parallel
     try:
-        with open(config.INDEX_FILE_PATH, 'r', encoding='utf-8') as f:
-            index_data = json.load(f)
-        
-        files = index_data.get("files", [])
+        print(f"\n[INFO] Index: {config.INDEX_DIR_PATH}")
+        print("[INFO] Analyzing for duplicates...\n")
         
-        if not files:
-            print("\n[INFO] No files found in index.")
-            print("[INFO] Run 'python cli/scan.py <directory>' first to scan files.")
-            return
-        
-        print(f"\n[INFO] Loaded {len(files)} files from index")
-        print(f"[INFO] Index file: {config.INDEX_FILE_PATH}\n")
+        summary = summarize_index(config.INDEX_DIR_PATH)
         
     except FileNotFoundError:
-        print(f"\n[ERROR] Index file not found: {config.INDEX_FILE_PATH}")
+        print(f"\n[ERROR] Index not found: {config.INDEX_DIR_PATH}")
         print("[INFO] Run 'python cli/scan.py <directory>' first to scan files.")
         sys.exit(1)
-    except json.JSONDecodeError:
+    except ValueError:
         print(f"\n[ERROR] Invalid JSON in index file")
         sys.exit(1)
     
-    # Find duplicates
-    print("[INFO] Analyzing for duplicates...\n")
+    if not summary["total_files"]:
+        print("[INFO] No files found in index.")
+        print("[INFO] Run 'python cli/scan.py <directory>' first to scan files.")
+        return
     
-    duplicate_groups = find_duplicates(files)
-    stats = count_duplicates(files)
-    wasted_space = calculate_wasted_space(files)
+    duplicate_groups = summary["groups"]
     
     # Display summary
     print("-"*60)
     print(" Summary")
     print("-"*60)
-    print(f" Total files scanned: {len(files)}")
-    print(f" Duplicate groups found: {stats['groups']}")
-    print(f" Total duplicate files: {stats['files']}")
-    print(f" Wasted space: {format_size(wasted_space)}")
+    print(f" Total files scanned: {summary['total_files']}")
+    print(f" Duplicate groups found: {len(duplicate_groups)}")
+    print(f" Total duplicate files: {summary['duplicate_files']}")
+    print(f" Wasted space: {format_size(summary['wasted_space'])}")
     print("-"*60 + "\n")
     
     # Display duplicate groups
@@ -11,10 +11,21 @@ PROJECT_ROOT = Path(__file__).parent
 # Data directory path
 DATA_DIR = PROJECT_ROOT / "data"
 
-# Index file path
-INDEX_FILE_PATH = str(DATA_DIR / "file_index.json")
+# Index directory: NDJSON shards partitioned by file size, listed in
+# index_manifest.json
+INDEX_DIR_PATH = str(DATA_DIR / "index")
 
-# Flask configuration
+# Content hash algorithm: "blake3" (in requirements.txt), "xxh3_128"
+# (pip install xxhash) or "sha256". Falls back to sha256 when the selected
+# package is not installed.
+HASH_ALGO = "blake3"
+
+# Cache of content hashes from earlier scans (SQLite), and the number of days
+# an entry is kept after the file was last seen
+HASH_CACHE_PATH = str(DATA_DIR / "hash_cache.sqlite")
+HASH_CACHE_MAX_AGE_DAYS = 30
+
+# Web UI (Quart) configuration
 FLASK_HOST = "127.0.0.1"
 FLASK_PORT = 5000
 FLASK_DEBUG = True
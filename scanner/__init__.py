@@ -1,5 +1,12 @@
 """Scanner package for file scanning functionality."""
 from .scanner import FileScanner
-from .duplicate_finder import find_duplicates, count_duplicates, calculate_wasted_space
+from .records import FileRecord
+from .duplicate_finder import (
+    find_duplicates, count_duplicates, calculate_wasted_space, summarize_duplicates,
+    summarize_index, group_duplicate_records
+)
 
-__all__ = ['FileScanner', 'find_duplicates', 'count_duplicates', 'calculate_wasted_space']
+__all__ = [
+    'FileScanner', 'FileRecord', 'find_duplicates', 'count_duplicates', 'calculate_wasted_space',
+    'summarize_duplicates', 'summarize_index', 'group_duplicate_records'
+]
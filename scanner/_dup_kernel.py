@@ -0,0 +1,77 @@
+"""
+Duplicate Grouping Kernel
+Groups columnar file metadata by hash key in a single compiled loop.
+
+Only defined when numba is installed; the compiled code is cached on disk,
+so only the first run pays for JIT compilation. Without numba,
+columns.group_columns groups with numpy instead.
+"""
+import numpy as np
+
+try:
+    import numba
+    from numba import types
+    from numba.typed import Dict
+except ImportError:
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True)
+    def group_by_hash(hashes, sizes):
+        """
+        Group record indices by hash key, in first-seen order.
+
+        Indexed loops (``for i in range(n)``) are used throughout, as numba
+        vectorizes them more reliably than iteration over array elements.
+
+        Args:
+            hashes (ndarray[uint64]): Hash key per record
+            sizes (ndarray[int64]): File size per record
+
+        Returns:
+            Tuple[ndarray, ndarray, ndarray]: ``order``, the record indices
+            sorted by group with record order kept inside each group;
+            ``group_starts``, the offset of each group in ``order`` plus a
+            final end offset; and ``group_sizes``, the file size of each
+            group's first record.
+        """
+        n = len(hashes)
+        group_of_hash = Dict.empty(key_type=types.uint64, value_type=types.int64)
+
+        group_ids = np.empty(n, dtype=np.int64)
+        group_first = np.empty(n, dtype=np.int64)
+        counts = np.zeros(n, dtype=np.int64)
+        num_groups = 0
+
+        for i in range(n):
+            key = hashes[i]
+            if key in group_of_hash:
+                group_id = group_of_hash[key]
+            else:
+                group_id = num_groups
+                group_of_hash[key] = group_id
+                group_first[group_id] = i
+                num_groups += 1
+            group_ids[i] = group_id
+            counts[group_id] += 1
+
+        group_starts = np.zeros(num_groups + 1, dtype=np.int64)
+        for g in range(num_groups):
+            group_starts[g + 1] = group_starts[g] + counts[g]
+
+        # Counting sort of the record indices by group
+        next_slot = group_starts[:num_groups].copy()
+        order = np.empty(n, dtype=np.int64)
+        for i in range(n):
+            group_id = group_ids[i]
+            order[next_slot[group_id]] = i
+            next_slot[group_id] += 1
+
+        group_sizes = np.empty(num_groups, dtype=np.int64)
+        for g in range(num_groups):
+            group_sizes[g] = sizes[group_first[g]]
+
+        return order, group_starts, group_sizes
@@ -0,0 +1,133 @@
+"""
+Columnar File Metadata Module
+Converts file records into a struct-of-arrays layout so
+duplicate analysis can run as vectorized numpy operations.
+
+numpy is optional; check NUMPY_AVAILABLE before calling to_columns.
+"""
+import warnings
+from typing import Dict, Iterable
+
+from .records import FileRecord
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+_numba_warning_shown = False
+
+
+def hash_key(file_hash: bytes) -> int:
+    """
+    Truncate a raw digest to a 64-bit integer key.
+
+    64 bits keep accidental collisions negligible for deduplication
+    (about 1 in 10^7 for a million hashed files). The key is taken from
+    the end of the digest: digests of another algorithm than HASH_ALGO
+    start with their tag (see index_store.decode_hash), which must not
+    take the place of digest bits.
+
+    Args:
+        file_hash (bytes): Raw digest
+
+    Returns:
+        int: The last 64 bits of the digest
+    """
+    return int.from_bytes(file_hash[-8:], "big")
+
+
+def is_columns(file_metadata) -> bool:
+    """Return True if file_metadata is a struct-of-arrays from to_columns."""
+    return isinstance(file_metadata, dict) and "hashes" in file_metadata
+
+
+def to_columns(file_metadata: Iterable[FileRecord]) -> Dict[str, any]:
+    """
+    Convert file records into parallel columns.
+
+    Records without a hash cannot be duplicates and are left out.
+
+    Args:
+        file_metadata (Iterable[FileRecord]): File records.
+
+    Returns:
+        Dict: 'paths' (list of str), 'sizes' (int64 array) and 'hashes'
+              (uint64 array of hash_key values), all in record order.
+    """
+    paths = []
+    sizes = []
+    keys = []
+
+    for record in file_metadata:
+        if not record.hash:
+            continue
+
+        paths.append(record.path)
+        sizes.append(record.size)
+        keys.append(hash_key(record.hash))
+
+    return {
+        "paths": paths,
+        "sizes": np.array(sizes, dtype=np.int64),
+        "hashes": np.array(keys, dtype=np.uint64),
+    }
+
+
+def group_columns(columns: Dict[str, any]):
+    """
+    Group column indices by hash.
+
+    Args:
+        columns (Dict): Struct-of-arrays from to_columns
+
+    Returns:
+        Tuple[List[ndarray], ndarray, ndarray]: Index arrays of the
+        duplicate groups (2+ members), ordered by first occurrence with
+        members in record order; the count of members in each of those
+        groups; and the file size of each group's first member.
+    """
+    hashes = columns["hashes"]
+    if not len(hashes):
+        return [], np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    # Importing numba takes several times longer than numpy, so the kernel
+    # is only loaded once columns are actually grouped
+    from . import _dup_kernel
+
+    if _dup_kernel.NUMBA_AVAILABLE:
+        order, group_starts, group_sizes = _dup_kernel.group_by_hash(hashes, columns["sizes"])
+        counts = np.diff(group_starts)
+        duplicate_ids = np.nonzero(counts > 1)[0]
+        groups = [
+            order[group_starts[group_id]:group_starts[group_id + 1]]
+            for group_id in duplicate_ids
+        ]
+        return groups, counts[duplicate_ids], group_sizes[duplicate_ids]
+
+    global _numba_warning_shown
+    if not _numba_warning_shown:
+        _numba_warning_shown = True
+        warnings.warn(
+            "numba is not installed; grouping duplicates with numpy instead "
+            "of the compiled kernel.",
+            RuntimeWarning,
+        )
+
+    _, inverse, counts = np.unique(hashes, return_inverse=True, return_counts=True)
+
+    # Stable sort keeps record order within each group
+    order = np.argsort(inverse, kind="stable")
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    duplicate_ids = np.nonzero(counts > 1)[0]
+    duplicate_ids = duplicate_ids[np.argsort(order[starts[duplicate_ids]], kind="stable")]
+
+    groups = [
+        order[starts[group_id]:starts[group_id] + counts[group_id]]
+        for group_id in duplicate_ids
+    ]
+    first_sizes = columns["sizes"][order[starts[duplicate_ids]]]
+    return groups, counts[duplicate_ids], first_sizes
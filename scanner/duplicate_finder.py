@@ -1,17 +1,33 @@
 """
 Duplicate File Finder Module
-Identifies duplicate files by comparing SHA-256 hashes.
+Identifies duplicate files by comparing content hashes.
 """
-from typing import List, Dict
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Dict
 
+from .index_store import count_index, iter_index, list_shards
+from .records import FileRecord
 
-def find_duplicates(file_metadata: List[Dict[str, any]]) -> List[List[str]]:
+# summarize_index uses worker processes only for indexes of at least this
+# many records. Summarizing takes ~5 us per record inline and starting the
+# pool ~0.4 s, so smaller indexes are summarized sooner in this process.
+PARALLEL_MIN_RECORDS = 100_000
+
+
+def find_duplicates(file_metadata: Iterable[FileRecord]) -> List[List[str]]:
     """
     Find duplicate files by grouping them by identical hash values.
     
+    file_metadata may also be an iterator streaming records from the
+    index, which is consumed in a single pass with a dict, or a
+    struct-of-arrays from columns.to_columns, which is grouped with numpy.
+    
     Args:
-        file_metadata (List[Dict]): List of file metadata dictionaries.
-                                     Each dict must contain 'path' and 'hash' keys.
+        file_metadata (Iterable[FileRecord] or Dict): File records, or columns
+                                     from to_columns. 'hash' may be None for
+                                     files that were not hashed because their
+                                     size is unique.
     
     Returns:
         List[List[str]]: List of duplicate groups. Each group is a list of file paths
@@ -19,61 +35,121 @@ def find_duplicates(file_metadata: List[Dict[str, any]]) -> List[List[str]]:
     
     Example:
         >>> files = [
-        ...     {"path": "/a/file1.txt", "size": 100, "hash": "abc123"},
-        ...     {"path": "/b/file2.txt", "size": 100, "hash": "abc123"},
-        ...     {"path": "/c/file3.txt", "size": 200, "hash": "def456"}
+        ...     FileRecord("/a/", "file1.txt", 100, hash=b"\\xab\\xc1"),
+        ...     FileRecord("/b/", "file2.txt", 100, hash=b"\\xab\\xc1"),
+        ...     FileRecord("/c/", "file3.txt", 200)
         ... ]
         >>> find_duplicates(files)
         [['/a/file1.txt', '/b/file2.txt']]
     """
-    # Group files by hash
+    column_groups = _group_columns(file_metadata)
+    if column_groups is not None:
+        groups, _, _ = column_groups
+        paths = file_metadata["paths"]
+        return [[paths[index] for index in group] for group in groups]
+    
+    return [[record.path for record in group] for group in group_duplicate_records(file_metadata)]
+
+
+def _group_columns(file_metadata):
+    """
+    Group file_metadata with columns.group_columns if it is a
+    struct-of-arrays from to_columns.
+    
+    columns imports numpy, so it is only imported for such input rather
+    than by every process that imports the scanner package.
+    
+    Returns:
+        Tuple or None: The result of group_columns, or None for records
+    """
+    if not isinstance(file_metadata, dict):
+        return None
+    
+    from .columns import group_columns, is_columns
+    if not is_columns(file_metadata):
+        return None
+    return group_columns(file_metadata)
+
+
+def group_duplicate_records(file_metadata: Iterable[FileRecord]) -> List[List[FileRecord]]:
+    """
+    Group file records by identical hash values.
+    
+    Like find_duplicates, but each group holds the full records instead of
+    their paths, so callers can show sizes and names and derive counts
+    and wasted space without grouping file_metadata again.
+    
+    Args:
+        file_metadata (Iterable[FileRecord]): File records.
+    
+    Returns:
+        List[List[FileRecord]]: Duplicate groups (2+ records), in first-seen order.
+    """
+    hash_groups, _ = _group_by_hash(file_metadata)
+    
+    # Filter groups to include only duplicates (2+ files with same hash)
+    return [group for group in hash_groups.values() if len(group) > 1]
+
+
+def _group_by_hash(file_metadata: Iterable[FileRecord]):
+    """
+    Group records that have a hash by their hash.
+    
+    Args:
+        file_metadata (Iterable[FileRecord]): File records.
+    
+    Returns:
+        Tuple[Dict[bytes, List[FileRecord]], int]: Records per hash, in
+                                                   first-seen order, and the
+                                                   number of records read.
+    """
     hash_groups = {}
+    total_files = 0
     
-    for file_info in file_metadata:
-        file_hash = file_info.get("hash")
-        file_path = file_info.get("path")
+    for record in file_metadata:
+        total_files += 1
+        file_hash = record.hash
         
-        # Skip files without hash or path
-        if not file_hash or not file_path:
+        # Skip files without hash
+        if not file_hash:
             continue
         
-        # Add file to hash group
-        if file_hash not in hash_groups:
-            hash_groups[file_hash] = []
-        
-        hash_groups[file_hash].append(file_path)
+        group = hash_groups.get(file_hash)
+        if group is None:
+            hash_groups[file_hash] = [record]
+        else:
+            group.append(record)
     
-    # Filter groups to include only duplicates (2+ files with same hash)
-    duplicates = [
-        paths for paths in hash_groups.values()
-        if len(paths) > 1
-    ]
-    
-    return duplicates
+    return hash_groups, total_files
 
 
-def count_duplicates(file_metadata: List[Dict[str, any]]) -> Dict[str, int]:
+def count_duplicates(file_metadata: List[FileRecord]) -> Dict[str, int]:
     """
     Count the number of duplicate groups and total duplicate files.
     
     Args:
-        file_metadata (List[Dict]): List of file metadata dictionaries.
+        file_metadata (List[FileRecord] or Dict): File records, or columns
+                                                  from to_columns.
     
     Returns:
         Dict[str, int]: Dictionary with 'groups' (number of duplicate groups) and
                         'files' (total number of duplicate files).
     """
-    duplicate_groups = find_duplicates(file_metadata)
-    
-    total_duplicate_files = sum(len(group) for group in duplicate_groups)
+    column_groups = _group_columns(file_metadata)
+    if column_groups is not None:
+        _, counts, _ = column_groups
+        group_sizes = counts.tolist()
+    else:
+        hash_groups, _ = _group_by_hash(file_metadata)
+        group_sizes = [len(group) for group in hash_groups.values() if len(group) > 1]
     
     return {
-        "groups": len(duplicate_groups),
-        "files": total_duplicate_files
+        "groups": len(group_sizes),
+        "files": sum(group_sizes)
     }
 
 
-def calculate_wasted_space(file_metadata: List[Dict[str, any]]) -> int:
+def calculate_wasted_space(file_metadata: List[FileRecord]) -> int:
     """
     Calculate total wasted storage space from duplicate files.
     
@@ -81,35 +157,122 @@ def calculate_wasted_space(file_metadata: List[Dict[str, any]]) -> int:
     where n is the number of duplicates.
     
     Args:
-        file_metadata (List[Dict]): List of file metadata dictionaries.
-                                     Each dict must contain 'path', 'hash', and 'size'.
+        file_metadata (List[FileRecord] or Dict): File records, or columns
+                                                  from to_columns.
     
     Returns:
         int: Total wasted space in bytes.
     """
-    # Group files by hash with size information
-    hash_groups = {}
+    column_groups = _group_columns(file_metadata)
+    if column_groups is not None:
+        _, counts, first_sizes = column_groups
+        return int(((counts - 1) * first_sizes).sum())
     
-    for file_info in file_metadata:
-        file_hash = file_info.get("hash")
-        file_size = file_info.get("size", 0)
+    # Every occurrence of a hash after the first is wasted space. Files
+    # with the same hash have the same size, so no grouping is needed.
+    seen_hashes = set()
+    wasted_space = 0
+    
+    for record in file_metadata:
+        file_hash = record.hash
         
         if not file_hash:
             continue
         
-        if file_hash not in hash_groups:
-            hash_groups[file_hash] = {
-                "count": 0,
-                "size": file_size
-            }
-        
-        hash_groups[file_hash]["count"] += 1
+        if file_hash in seen_hashes:
+            wasted_space += record.size
+        else:
+            seen_hashes.add(file_hash)
+    
+    return wasted_space
+
+
+def summarize_duplicates(file_metadata: Iterable[FileRecord]) -> Dict[str, any]:
+    """
+    Compute duplicate groups, counts and wasted space in a single pass.
+    
+    Equivalent to calling find_duplicates, count_duplicates and
+    calculate_wasted_space, but file_metadata is only iterated once, so it
+    can be an iterator streaming records from the index.
     
-    # Calculate wasted space
+    Args:
+        file_metadata (Iterable[FileRecord]): File records.
+    
+    Returns:
+        Dict: 'total_files' (records seen), 'groups' (list of duplicate path
+              groups), 'duplicate_files' and 'wasted_space' (bytes).
+    """
+    hash_groups, total_files = _group_by_hash(file_metadata)
+    
+    groups = []
     wasted_space = 0
-    for group_info in hash_groups.values():
-        if group_info["count"] > 1:
-            # Wasted space = (n-1) * file_size
-            wasted_space += (group_info["count"] - 1) * group_info["size"]
+    for group in hash_groups.values():
+        if len(group) > 1:
+            groups.append([record.path for record in group])
+            wasted_space += (len(group) - 1) * group[0].size
     
-    return wasted_space
+    return {
+        "total_files": total_files,
+        "groups": groups,
+        "duplicate_files": sum(len(group) for group in groups),
+        "wasted_space": wasted_space
+    }
+
+
+def summarize_index(index_path: str, max_workers: int = None) -> Dict[str, any]:
+    """
+    Summarize the duplicates of a sharded index, one shard per process.
+
+    Duplicates always share a size, and so a shard, so the shards are
+    summarized independently and their results concatenated. Only one
+    shard per worker is held in memory at a time. Indexes of fewer than
+    PARALLEL_MIN_RECORDS records, going by the manifest, are summarized
+    in this process.
+
+    Args:
+        index_path (str): Directory of the index, or an index file
+        max_workers (int, optional): Number of worker processes. Defaults
+                                     to the CPU count.
+
+    Returns:
+        Dict: Same keys as summarize_duplicates.
+
+    Raises:
+        FileNotFoundError: If the index does not exist
+        ValueError: If the index contains invalid JSON
+    """
+    shards = list_shards(index_path)
+
+    if len(shards) < 2 or max_workers == 1 or count_index(index_path) < PARALLEL_MIN_RECORDS:
+        shard_summaries = map(_summarize_shard, shards)
+        return _merge_summaries(shard_summaries)
+
+    # Spawned, not forked, as the caller may be running threads
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        return _merge_summaries(executor.map(_summarize_shard, shards))
+
+
+def _summarize_shard(shard_path: str) -> Dict[str, any]:
+    """Summarize one index shard. Runs in a worker process."""
+    return summarize_duplicates(iter_index(shard_path))
+
+
+def _merge_summaries(summaries: Iterable[Dict[str, any]]) -> Dict[str, any]:
+    """Combine the summaries of disjoint shards."""
+    merged = {
+        "total_files": 0,
+        "groups": [],
+        "duplicate_files": 0,
+        "wasted_space": 0
+    }
+
+    for summary in summaries:
+        merged["total_files"] += summary["total_files"]
+        merged["groups"].extend(summary["groups"])
+        merged["duplicate_files"] += summary["duplicate_files"]
+        merged["wasted_space"] += summary["wasted_space"]
+
+    return merged
@@ -0,0 +1,242 @@
+"""
+Hash Cache Module
+Persists content and head hashes in SQLite, keyed by path, size and
+modification time, so unchanged files are not rehashed on later scans.
+"""
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from .hash_utils import HASH_ALGO, HEAD_ALGO
+
+# Pending writes are committed in transactions of this many rows.
+BATCH_SIZE = 1000
+
+# Bumped whenever the table layout changes; older caches are discarded.
+SCHEMA_VERSION = 1
+
+_SECONDS_PER_DAY = 24 * 60 * 60
+
+# Head hashes are unsigned 64-bit; SQLite integers are signed.
+_UINT64 = 1 << 64
+_INT64_MAX = (1 << 63) - 1
+
+# Inserts a row, or updates the row of the same path. A put for the same
+# version (size, mtime_ns) of a file keeps the hash it does not set; a put
+# for a changed file discards it.
+_UPSERT = """
+    INSERT INTO hashes (path, size, mtime_ns, head_algo, head, algo, digest, last_seen)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(path) DO UPDATE SET
+        head_algo = CASE
+            WHEN excluded.head IS NULL AND size = excluded.size AND mtime_ns = excluded.mtime_ns
+            THEN head_algo ELSE excluded.head_algo END,
+        head = CASE
+            WHEN excluded.head IS NULL AND size = excluded.size AND mtime_ns = excluded.mtime_ns
+            THEN head ELSE excluded.head END,
+        algo = CASE
+            WHEN excluded.digest IS NULL AND size = excluded.size AND mtime_ns = excluded.mtime_ns
+            THEN algo ELSE excluded.algo END,
+        digest = CASE
+            WHEN excluded.digest IS NULL AND size = excluded.size AND mtime_ns = excluded.mtime_ns
+            THEN digest ELSE excluded.digest END,
+        size = excluded.size,
+        mtime_ns = excluded.mtime_ns,
+        last_seen = excluded.last_seen
+"""
+
+
+def _to_signed(value: int) -> int:
+    """Map an unsigned 64-bit integer onto SQLite's signed range."""
+    return value - _UINT64 if value > _INT64_MAX else value
+
+
+def _to_unsigned(value: int) -> int:
+    """Inverse of _to_signed."""
+    return value + _UINT64 if value < 0 else value
+
+
+class HashCache:
+    """SQLite-backed cache of file digests and head hashes."""
+
+    def __init__(self, db_path: str, max_age_days: int = None):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path (str): Path of the SQLite database file
+            max_age_days (int, optional): Entries not seen by a scan for this
+                                          many days are deleted on open
+        """
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        # Autocommit mode; writes are grouped by explicit transactions in flush().
+        # An async scan calls the cache from one thread pool thread after
+        # another, never from two at once, so the connection is not tied to
+        # the thread that opened it.
+        self._conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS hashes")
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        # Each row describes one version (size, mtime_ns) of a file; head
+        # and digest are NULL until computed, and are tagged with the
+        # algorithm that produced them.
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            " path TEXT PRIMARY KEY,"
+            " size INTEGER NOT NULL,"
+            " mtime_ns INTEGER NOT NULL,"
+            " head_algo TEXT,"
+            " head INTEGER,"
+            " algo TEXT,"
+            " digest BLOB,"
+            " last_seen INTEGER NOT NULL)"
+        )
+        self._now = int(time.time())
+        self._pending_puts = []
+        self._pending_touches = []
+
+        if max_age_days is not None:
+            self.prune(max_age_days)
+
+    def get(self, path: str, size: int, mtime_ns: int) -> Optional[bytes]:
+        """
+        Look up the digest of a file.
+
+        Args:
+            path (str): Absolute path of the file
+            size (int): Current size of the file in bytes
+            mtime_ns (int): Current modification time in nanoseconds
+
+        Returns:
+            Optional[bytes]: The cached digest, or None if the file is not
+                             cached, has changed, or was hashed with another
+                             algorithm.
+        """
+        row = self._conn.execute(
+            "SELECT digest FROM hashes"
+            " WHERE path = ? AND size = ? AND mtime_ns = ? AND algo = ?",
+            (path, size, mtime_ns, HASH_ALGO)
+        ).fetchone()
+
+        if row is None or row[0] is None:
+            return None
+
+        self._touch(path)
+        return row[0]
+
+    def get_head(self, path: str, size: int, mtime_ns: int) -> Optional[int]:
+        """
+        Look up the head hash of a file.
+
+        Args:
+            path (str): Absolute path of the file
+            size (int): Current size of the file in bytes
+            mtime_ns (int): Current modification time in nanoseconds
+
+        Returns:
+            Optional[int]: The cached head hash, or None if the file is not
+                           cached, has changed, or was hashed with another
+                           algorithm.
+        """
+        row = self._conn.execute(
+            "SELECT head FROM hashes"
+            " WHERE path = ? AND size = ? AND mtime_ns = ? AND head_algo = ?",
+            (path, size, mtime_ns, HEAD_ALGO)
+        ).fetchone()
+
+        if row is None or row[0] is None:
+            return None
+
+        self._touch(path)
+        return _to_unsigned(row[0])
+
+    def put(self, path: str, size: int, mtime_ns: int, digest: bytes):
+        """
+        Store the digest of a file, replacing any previous entry.
+
+        Args:
+            path (str): Absolute path of the file
+            size (int): Size of the file in bytes
+            mtime_ns (int): Modification time in nanoseconds
+            digest (bytes): Raw digest
+        """
+        self._queue_put((path, size, mtime_ns, None, None, HASH_ALGO, digest, self._now))
+
+    def put_head(self, path: str, size: int, mtime_ns: int, head: int):
+        """
+        Store the head hash of a file, replacing any previous entry.
+
+        Args:
+            path (str): Absolute path of the file
+            size (int): Size of the file in bytes
+            mtime_ns (int): Modification time in nanoseconds
+            head (int): Unsigned 64-bit head hash
+        """
+        self._queue_put(
+            (path, size, mtime_ns, HEAD_ALGO, _to_signed(head), None, None, self._now)
+        )
+
+    def flush(self):
+        """Commit pending writes in a single transaction."""
+        if not self._pending_puts and not self._pending_touches:
+            return
+
+        with self._transaction():
+            self._conn.executemany(_UPSERT, self._pending_puts)
+            self._conn.executemany(
+                "UPDATE hashes SET last_seen = ? WHERE path = ?",
+                self._pending_touches
+            )
+
+        self._pending_puts = []
+        self._pending_touches = []
+
+    def prune(self, max_age_days: int):
+        """
+        Delete entries that no scan has used for max_age_days days.
+
+        Args:
+            max_age_days (int): Maximum age in days
+        """
+        cutoff = self._now - max_age_days * _SECONDS_PER_DAY
+        self._conn.execute("DELETE FROM hashes WHERE last_seen < ?", (cutoff,))
+
+    def close(self):
+        """Flush pending writes and close the database."""
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _queue_put(self, row: tuple):
+        """Buffer an upsert, flushing when the batch is full."""
+        self._pending_puts.append(row)
+        if len(self._pending_puts) >= BATCH_SIZE:
+            self.flush()
+
+    def _touch(self, path: str):
+        """Buffer a last_seen update, flushing when the batch is full."""
+        self._pending_touches.append((self._now, path))
+        if len(self._pending_touches) >= BATCH_SIZE:
+            self.flush()
+
+    @contextmanager
+    def _transaction(self):
+        """Run the enclosed statements in one transaction."""
+        self._conn.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
@@ -1,28 +1,196 @@
 from pathlib import Path
+from typing import Optional
 import hashlib
+import mmap
+import os
+import warnings
 
+import config
 
-def generate_file_hash(file_path: str) -> str:
-    """Generate a SHA-256 hash for a file based on its binary content.
+try:
+    import _hashlib
+except ImportError:  # pragma: no cover - CPython built without OpenSSL
+    _hashlib = None
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+
+SUPPORTED_ALGORITHMS = ("blake3", "xxh3_128", "sha256")
+
+
+def _resolve_algorithm(name: str) -> str:
+    """Validate the configured algorithm, falling back to sha256 if its
+    package is not installed."""
+    if name not in SUPPORTED_ALGORITHMS:
+        raise ValueError(f"Unsupported hash algorithm: {name}")
+
+    if (name == "blake3" and blake3 is None) or (name == "xxh3_128" and xxhash is None):
+        warnings.warn(
+            f"Hash algorithm {name!r} is not installed; falling back to sha256.",
+            RuntimeWarning,
+        )
+        return "sha256"
+
+    return name
+
+
+# Algorithm used for content hashes. Hashes are raw digest bytes in memory;
+# the index stores them tagged with the algorithm, e.g. "blake3:<hex>", so
+# indexes built with another algorithm never match.
+HASH_ALGO = _resolve_algorithm(config.HASH_ALGO)
+
+
+# hashlib only routes SHA-256 through OpenSSL (and therefore SHA-NI on
+# capable CPUs) when CPython was linked against it. Without it the builtin
+# C implementation is used, which is several times slower on large files.
+# On such builds, pyca/cryptography's
+# ``hazmat.primitives.hashes.Hash(hashes.SHA256())`` talks to OpenSSL EVP
+# directly and is the recommended drop-in.
+OPENSSL_SHA256_AVAILABLE = hasattr(_hashlib, "openssl_sha256")
+
+if HASH_ALGO == "sha256" and not OPENSSL_SHA256_AVAILABLE:
+    warnings.warn(
+        "hashlib is not backed by OpenSSL SHA-256; file hashing will use the "
+        "slower builtin implementation.",
+        RuntimeWarning,
+    )
+
+
+# Files at or above this size are memory-mapped and handed to the hasher in a
+# single call instead of being streamed through a read loop.
+MMAP_THRESHOLD = 16 * 1024 * 1024
+
+# Number of leading bytes hashed by generate_head_hash.
+HEAD_SIZE = 4096
+
+# Algorithm used for head hashes. Heads are only a filter, so a fast 64-bit
+# non-cryptographic hash is enough: a collision merely costs a full hash.
+HEAD_ALGO = "xxh3_64" if xxhash is not None else HASH_ALGO
+
+
+def _new_sha256():
+    """Create a SHA-256 object, skipping FIPS wrappers where supported."""
+    return hashlib.new("sha256", usedforsecurity=False)
+
+
+def _new_hasher():
+    """Create a hash object for HASH_ALGO."""
+    if HASH_ALGO == "blake3":
+        return blake3.blake3()
+    if HASH_ALGO == "xxh3_128":
+        return xxhash.xxh3_128()
+    return _new_sha256()
+
+
+def _finish(hasher) -> bytes:
+    """Return the raw digest of a finished hash object."""
+    return hasher.digest()
+
+
+def sha_ni_available() -> bool:
+    """Report whether the CPU advertises the SHA-NI instruction set.
+
+    One-shot diagnostic for checking that OpenSSL can use hardware
+    SHA-256. Only Linux exposes the flags via /proc/cpuinfo; other
+    platforms report False.
+
+    Returns:
+        bool: True if the ``sha_ni`` flag is present.
+    """
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("flags") and "sha_ni" in line.split():
+                    return True
+    except OSError:
+        pass
+    return False
+
+
+def _advise(fd: int, advice_name: str):
+    """Pass a posix_fadvise hint for the whole file, where supported."""
+    advice = getattr(os, advice_name, None)
+    if advice is None or not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, advice)
+    except OSError:
+        pass
+
+
+def generate_file_hash(file_path: str) -> bytes:
+    """Generate a content hash for a file using HASH_ALGO.
+
+    Small files are hashed with ``hashlib.file_digest``, which runs the read
+    loop in C. Files of ``MMAP_THRESHOLD`` bytes or more are memory-mapped so
+    the whole file is consumed by one ``update()`` call; with BLAKE3 the
+    mapped file is hashed on all cores. On Linux the kernel is told the read
+    is sequential, and the pages are dropped afterwards so a large scan does
+    not evict the rest of the page cache.
 
     Args:
         file_path (str): Path to the file as a string.
 
     Returns:
-        str: Hex digest of the SHA-256 hash, or an empty string on error.
+        bytes: Raw digest, or empty bytes on error.
     """
     path = Path(file_path)
 
-    if not path.is_file():
-        return ""
+    try:
+        if not path.is_file():
+            return b""
+
+        with path.open("rb") as f:
+            fd = f.fileno()
+            _advise(fd, "POSIX_FADV_SEQUENTIAL")
 
-    sha256 = hashlib.sha256()
+            if os.fstat(fd).st_size < MMAP_THRESHOLD:
+                hasher = hashlib.file_digest(f, _new_hasher)
+            elif HASH_ALGO == "blake3":
+                hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+                hasher.update_mmap(file_path)
+            else:
+                hasher = _new_hasher()
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                    hasher.update(mm)
 
+            _advise(fd, "POSIX_FADV_DONTNEED")
+    except (OSError, ValueError):
+        return b""
+
+    return _finish(hasher)
+
+
+def generate_head_hash(file_path: str, length: int = HEAD_SIZE) -> Optional[int]:
+    """Generate a 64-bit hash of the first bytes of a file using HEAD_ALGO.
+
+    Used as a cheap filter before full hashing: files whose heads differ
+    cannot be identical.
+
+    Args:
+        file_path (str): Path to the file as a string.
+        length (int): Number of leading bytes to hash.
+
+    Returns:
+        Optional[int]: Unsigned 64-bit hash, or None on error.
+    """
     try:
-        with path.open("rb") as f:
-            for chunk in iter(lambda: f.read(1024 * 1024), b""):
-                sha256.update(chunk)
-    except (OSError, IOError):
-        return ""
+        with open(file_path, "rb") as f:
+            head = f.read(length)
+    except OSError:
+        return None
+
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(head)
 
-    return sha256.hexdigest()
+    hasher = _new_hasher()
+    hasher.update(head)
+    return int.from_bytes(_finish(hasher)[:8], "big")
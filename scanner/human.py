@@ -0,0 +1,25 @@
+"""
+Human-Readable Formatting Module
+Formats byte counts for the CLI reports and the web UI.
+"""
+
+_UNITS = ['B', 'KB', 'MB', 'GB', 'TB', 'PB']
+
+
+def format_size(size_bytes: int) -> str:
+    """
+    Format file size in human-readable format.
+
+    The unit is picked from the bit length of the size (every 10 bits is
+    one 1024x step), so there is a single division and no loop.
+
+    Args:
+        size_bytes (int): Size in bytes
+
+    Returns:
+        str: Formatted size string
+    """
+    if size_bytes <= 0:
+        return "0.00 B"
+    unit_index = min((size_bytes.bit_length() - 1) // 10, len(_UNITS) - 1)
+    return f"{size_bytes / (1 << (unit_index * 10)):.2f} {_UNITS[unit_index]}"
@@ -0,0 +1,322 @@
+"""
+File Index Storage Module
+Reads and writes the file index as NDJSON: one file record per line, so the
+index can be written incrementally and streamed back without loading it
+whole. Uses orjson when installed.
+
+The index is a directory of shards partitioned by file size,
+by_size-<id>/<bucket>.ndjson, listed in index_manifest.json. Duplicates always
+have the same size, so each shard can be analyzed on its own. Single-file
+indexes from older versions are still readable.
+
+Hashes are raw digest bytes in memory and are stored as algorithm-tagged hex
+strings ("blake3:ab12...") on disk. Hashes of another algorithm than
+HASH_ALGO keep their tag when loaded, so they never match current ones.
+"""
+import json
+import os
+import shutil
+import uuid
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+from .hash_utils import HASH_ALGO
+from .records import FileRecord
+
+MANIFEST_NAME = "index_manifest.json"
+
+# Each index is written to a new directory named SHARD_DIR-<id>; indexes
+# from earlier versions use SHARD_DIR itself.
+SHARD_DIR = "by_size"
+MANIFEST_VERSION = 1
+
+# Algorithm of the untagged hex digests in indexes from older versions
+LEGACY_HASH_ALGO = "sha256"
+
+
+def size_bucket(size: int) -> int:
+    """Return the shard bucket of a file size: size.bit_length() // 4,
+    i.e. (floor(log2(size)) + 1) // 4, so each bucket spans a 16x range of
+    sizes (bucket 0 holds sizes 0-7, bucket 1 sizes 8-127)."""
+    return size.bit_length() // 4
+
+
+def _dumps(record: Dict[str, any]) -> bytes:
+    """Serialize one record as a newline-terminated UTF-8 JSON line."""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _loads(line: bytes) -> Dict[str, any]:
+    """Parse one JSON line."""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def encode_hash(file_hash: bytes) -> str:
+    """Convert a raw digest into its tagged on-disk form."""
+    return f"{HASH_ALGO}:{file_hash.hex()}"
+
+
+def decode_hash(stored_hash: str) -> bytes:
+    """Convert a stored hash back into raw digest bytes. Digests of another
+    algorithm than HASH_ALGO are prefixed with their tag, e.g.
+    b"sha256:<digest>", so they only compare equal to each other. Untagged
+    hex digests from older indexes are LEGACY_HASH_ALGO."""
+    algo, _, digest = stored_hash.rpartition(":")
+    file_hash = bytes.fromhex(digest)
+    algo = algo or LEGACY_HASH_ALGO
+    if algo != HASH_ALGO:
+        return algo.encode("ascii") + b":" + file_hash
+    return file_hash
+
+
+def save_index(files_data: Iterable[FileRecord], index_path: str) -> int:
+    """
+    Write file records to a sharded index, one record per line.
+
+    Args:
+        files_data (Iterable[FileRecord]): File records
+        index_path (str): Directory of the index
+
+    Returns:
+        int: Number of records written
+    """
+    def stored_records():
+        for record in files_data:
+            file_info = record.to_dict()
+            if record.hash:
+                file_info["hash"] = encode_hash(record.hash)
+            yield file_info
+
+    return _write_shards(stored_records(), index_path)
+
+
+def _write_shards(stored_records: Iterable[Dict[str, any]], index_path: str) -> int:
+    """
+    Write records in their stored form to size shards and a manifest.
+
+    The shards are written to a new directory and the manifest is replaced
+    last, so readers see either the previous index or the complete new one.
+    Shard directories of previous indexes are then removed.
+
+    Args:
+        stored_records (Iterable[Dict]): Records with encoded hashes
+        index_path (str): Directory of the index
+
+    Returns:
+        int: Number of records written
+    """
+    # A plain mkdir, unlike tempfile.mkdtemp, keeps the umask's permissions
+    os.makedirs(index_path, exist_ok=True)
+    shard_dir_name = f"{SHARD_DIR}-{uuid.uuid4().hex}"
+    shard_dir = os.path.join(index_path, shard_dir_name)
+    os.mkdir(shard_dir)
+
+    shards = {}
+    counts = {}
+    try:
+        try:
+            for file_info in stored_records:
+                bucket = size_bucket(file_info.get("size", 0))
+                shard = shards.get(bucket)
+                if shard is None:
+                    shard = shards[bucket] = open(
+                        os.path.join(shard_dir, f"{bucket}.ndjson"), 'wb'
+                    )
+                    counts[bucket] = 0
+                shard.write(_dumps(file_info))
+                counts[bucket] += 1
+        finally:
+            for shard in shards.values():
+                shard.close()
+    except BaseException:
+        shutil.rmtree(shard_dir, ignore_errors=True)
+        raise
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "total_records": sum(counts.values()),
+        "shards": [
+            {"path": f"{shard_dir_name}/{bucket}.ndjson", "bucket": bucket, "records": counts[bucket]}
+            for bucket in sorted(counts)
+        ],
+    }
+
+    # Replace the manifest atomically so readers never see a partial one
+    manifest_path = os.path.join(index_path, MANIFEST_NAME)
+    with open(manifest_path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+    for name in os.listdir(index_path):
+        if name != shard_dir_name and (name == SHARD_DIR or name.startswith(f"{SHARD_DIR}-")):
+            shutil.rmtree(os.path.join(index_path, name), ignore_errors=True)
+
+    return manifest["total_records"]
+
+
+def _read_manifest(index_path: str) -> Dict[str, any]:
+    """Load the manifest of a sharded index."""
+    with open(os.path.join(index_path, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def list_shards(index_path: str) -> List[str]:
+    """
+    List the files holding the records of an index.
+
+    Args:
+        index_path (str): Directory of a sharded index, or an index file
+                          from an older version
+
+    Returns:
+        List[str]: Paths of the shard files; the index file itself for a
+                   single-file index
+
+    Raises:
+        FileNotFoundError: If the index does not exist
+    """
+    if not os.path.isdir(index_path):
+        if not os.path.exists(index_path):
+            raise FileNotFoundError(index_path)
+        return [index_path]
+
+    return [
+        os.path.join(index_path, shard["path"])
+        for shard in _read_manifest(index_path)["shards"]
+    ]
+
+
+def iter_index(index_path: str) -> Iterator[FileRecord]:
+    """
+    Stream file records from an index, with hashes decoded to bytes.
+
+    Args:
+        index_path (str): Directory of the index, a single shard, or an
+                          index file from an older version
+
+    Yields:
+        FileRecord: File records
+
+    Raises:
+        FileNotFoundError: If the index does not exist
+        ValueError: If the index contains invalid JSON
+    """
+    stored_records = chain.from_iterable(map(_iter_stored, list_shards(index_path)))
+    for file_info in stored_records:
+        stored_hash = file_info.get("hash")
+        if stored_hash:
+            file_info["hash"] = decode_hash(stored_hash)
+        yield FileRecord.from_dict(file_info)
+
+
+def _iter_stored(index_path: str) -> Iterator[Dict[str, any]]:
+    """
+    Stream file records from one index file exactly as stored.
+
+    Indexes written before the NDJSON format (a single JSON object with a
+    "files" list) are still readable; they are streamed with ijson when
+    installed.
+
+    Args:
+        index_path (str): Path of the shard or index file
+
+    Yields:
+        Dict: File information dictionaries
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file contains invalid JSON
+    """
+    with open(index_path, 'rb') as f:
+        first_line = f.readline()
+
+        if _is_legacy_index(first_line):
+            f.seek(0)
+            if ijson is not None:
+                yield from ijson.items(f, "files.item", use_float=True)
+            else:
+                yield from json.load(f).get("files", [])
+            return
+
+        for line in chain([first_line], f):
+            if line.strip():
+                yield _loads(line)
+
+
+def _is_legacy_index(first_line: bytes) -> bool:
+    """Return True if first_line starts a pre-NDJSON index document."""
+    try:
+        record = _loads(first_line)
+    except ValueError:
+        # An indented JSON document opens with a lone "{"
+        return first_line.strip() == b"{"
+    return isinstance(record, dict) and "files" in record
+
+
+def read_index_page(index_path: str, offset: int, limit: int) -> List[Dict[str, any]]:
+    """
+    Read a slice of records from an index without loading the rest.
+    Records are returned as stored, with tagged hex hashes, for display.
+    Shards before the slice are skipped using the manifest's counts.
+
+    Args:
+        index_path (str): Directory of the index, or an index file
+        offset (int): Number of records to skip
+        limit (int): Maximum number of records to return
+
+    Returns:
+        List[Dict]: File information dictionaries
+    """
+    if not os.path.isdir(index_path):
+        return list(islice(_iter_stored(index_path), offset, offset + limit))
+
+    page = []
+    for shard in _read_manifest(index_path)["shards"]:
+        if len(page) >= limit:
+            break
+        if offset >= shard["records"]:
+            offset -= shard["records"]
+            continue
+
+        shard_path = os.path.join(index_path, shard["path"])
+        page.extend(islice(_iter_stored(shard_path), offset, offset + limit - len(page)))
+        offset = 0
+
+    return page
+
+
+def count_index(index_path: str) -> int:
+    """
+    Count the records in an index. Sharded indexes are counted from the
+    manifest and NDJSON files by line, without parsing the records.
+
+    Args:
+        index_path (str): Directory of the index, or an index file
+
+    Returns:
+        int: Number of records
+    """
+    if os.path.isdir(index_path):
+        return _read_manifest(index_path)["total_records"]
+
+    with open(index_path, 'rb') as f:
+        first_line = f.readline()
+        if not _is_legacy_index(first_line):
+            return sum(1 for line in chain([first_line], f) if line.strip())
+
+    return sum(1 for _ in _iter_stored(index_path))
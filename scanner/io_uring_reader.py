@@ -0,0 +1,202 @@
+"""
+io_uring File Reader Module
+Hashes batches of files through a single io_uring on Linux, so reads for
+many files are submitted and completed with few syscalls.
+
+Requires the optional ``liburing`` package (the 2024.x API; 2026 releases
+renamed it) and a Linux 5.6+ kernel. On any other platform, or with an
+unsupported binding, hash_files falls back to generate_file_hash per file.
+"""
+import os
+import platform
+import sys
+from typing import List
+
+try:
+    import liburing
+except ImportError:
+    liburing = None
+
+from .hash_utils import MMAP_THRESHOLD, _finish, _new_hasher, generate_file_hash
+
+# Size of each read request, and of each per-slot buffer.
+READ_SIZE = 256 * 1024
+
+# Maximum number of files being read at the same time.
+QUEUE_DEPTH = 64
+
+# Adaptive submission: queued reads are submitted eagerly while few are in
+# flight, and held back while the ring is busy so each io_uring_enter call
+# carries a larger batch.
+SUBMIT_LOW_WATERMARK = 8
+SUBMIT_HIGH_WATERMARK = 32
+
+
+def _kernel_supports_io_uring() -> bool:
+    """Return True on Linux 5.6 or newer, which supports IORING_OP_READ."""
+    if not sys.platform.startswith("linux"):
+        return False
+
+    try:
+        major, minor = platform.release().split(".")[:2]
+        return (int(major), int(minor)) >= (5, 6)
+    except ValueError:
+        return False
+
+
+# Names used from the liburing binding; releases from 2026 on removed or
+# renamed several of them.
+_REQUIRED_API = (
+    "iovec", "io_uring", "io_uring_cqe", "io_uring_queue_init", "io_uring_queue_exit",
+    "io_uring_get_sqe", "io_uring_prep_read", "io_uring_sqe_set_data64",
+    "io_uring_submit", "io_uring_wait_cqe", "io_uring_cqe_seen",
+)
+
+
+def _binding_supports_api(module) -> bool:
+    """Return True if the liburing binding provides every name used here."""
+    return all(hasattr(module, name) for name in _REQUIRED_API)
+
+
+IO_URING_AVAILABLE = (
+    liburing is not None
+    and _binding_supports_api(liburing)
+    and _kernel_supports_io_uring()
+)
+
+
+def hash_files(paths: List[str]) -> List[bytes]:
+    """
+    Hash a batch of files, reading them through io_uring when available.
+
+    Files of MMAP_THRESHOLD bytes or more are always hashed with
+    generate_file_hash, which memory-maps them.
+
+    Args:
+        paths (List[str]): Paths of the files to hash
+
+    Returns:
+        List[bytes]: Raw digests matching paths; empty bytes for files that
+                     could not be read.
+    """
+    if not IO_URING_AVAILABLE or len(paths) < 2:
+        return [generate_file_hash(path) for path in paths]
+
+    hashes = [b""] * len(paths)
+    small_files = []
+
+    for index, path in enumerate(paths):
+        try:
+            size = os.stat(path).st_size
+        except OSError:
+            continue
+
+        if size >= MMAP_THRESHOLD:
+            hashes[index] = generate_file_hash(path)
+        else:
+            small_files.append((index, path))
+
+    try:
+        for index, file_hash in _hash_files_uring(small_files):
+            hashes[index] = file_hash
+    except OSError:
+        # The ring could not be set up (e.g. io_uring disabled by sysctl)
+        for index, path in small_files:
+            hashes[index] = generate_file_hash(path)
+
+    return hashes
+
+
+def _hash_files_uring(files):
+    """
+    Read and hash files through one io_uring.
+
+    Each in-flight file owns one slot with a preallocated buffer and has at
+    most one outstanding read, so its chunks are hashed in order.
+
+    Args:
+        files (List[Tuple[int, str]]): (index, path) pairs
+
+    Returns:
+        List[Tuple[int, bytes]]: (index, digest) pairs; the digest is empty
+                                 for files that could not be read.
+    """
+    results = []
+    pending = iter(files)
+    buffers = [bytearray(READ_SIZE) for _ in range(QUEUE_DEPTH)]
+    iovecs = [liburing.iovec(buffer) for buffer in buffers]
+    slots = [None] * QUEUE_DEPTH
+    free_slots = list(range(QUEUE_DEPTH))
+    in_flight = 0
+    queued = 0
+
+    ring = liburing.io_uring()
+    cqe = liburing.io_uring_cqe()
+    liburing.io_uring_queue_init(QUEUE_DEPTH, ring, 0)
+
+    def queue_read(slot):
+        fd, offset = slots[slot][1], slots[slot][3]
+        sqe = liburing.io_uring_get_sqe(ring)
+        liburing.io_uring_prep_read(sqe, fd, iovecs[slot].iov_base, READ_SIZE, offset)
+        liburing.io_uring_sqe_set_data64(sqe, slot)
+
+    def release(slot, file_hash):
+        index, fd = slots[slot][:2]
+        os.close(fd)
+        results.append((index, file_hash))
+        slots[slot] = None
+        free_slots.append(slot)
+
+    try:
+        while True:
+            # Start reading new files while slots are free
+            while free_slots:
+                next_file = next(pending, None)
+                if next_file is None:
+                    break
+
+                index, path = next_file
+                try:
+                    fd = os.open(path, os.O_RDONLY)
+                except OSError:
+                    results.append((index, b""))
+                    continue
+
+                slot = free_slots.pop()
+                slots[slot] = [index, fd, _new_hasher(), 0]
+                queue_read(slot)
+                queued += 1
+
+            if queued and (in_flight < SUBMIT_LOW_WATERMARK
+                           or in_flight + queued <= SUBMIT_HIGH_WATERMARK):
+                liburing.io_uring_submit(ring)
+                in_flight += queued
+                queued = 0
+
+            if not in_flight:
+                break
+
+            ret = liburing.io_uring_wait_cqe(ring, cqe)
+            if ret is not None and ret < 0:
+                raise OSError(-ret, os.strerror(-ret))
+            slot = cqe.user_data
+            result = cqe.res
+            liburing.io_uring_cqe_seen(ring, cqe)
+            in_flight -= 1
+
+            if result < 0:
+                release(slot, b"")
+            elif result == 0:
+                release(slot, _finish(slots[slot][2]))
+            else:
+                slots[slot][2].update(memoryview(buffers[slot])[:result])
+                slots[slot][3] += result
+                queue_read(slot)
+                queued += 1
+    finally:
+        for state in slots:
+            if state is not None:
+                os.close(state[1])
+        liburing.io_uring_queue_exit(ring)
+
+    return results
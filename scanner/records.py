@@ -0,0 +1,77 @@
+"""
+File Record Module
+Compact, immutable records describing scanned files.
+"""
+import os
+import sys
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+@dataclass(slots=True, frozen=True)
+class FileRecord:
+    """
+    Information about one scanned file.
+
+    The path is split into its directory prefix and name. All files of a
+    directory share one prefix string, so a million records do not hold a
+    million copies of their parent paths.
+
+    Attributes:
+        dir_prefix (str): Directory of the file, ending with a separator
+        name (str): File name
+        size (int): Size in bytes
+        mtime_ns (int, optional): Modification time in nanoseconds
+        hash (bytes, optional): Raw content digest; None if the file was not
+                                hashed because its size is unique
+    """
+    dir_prefix: str
+    name: str
+    size: int
+    mtime_ns: Optional[int] = None
+    hash: Optional[bytes] = None
+
+    @property
+    def path(self) -> str:
+        """Absolute path of the file."""
+        return self.dir_prefix + self.name
+
+    def to_dict(self) -> Dict[str, any]:
+        """
+        Convert the record to an index entry.
+
+        Returns:
+            Dict: 'path', 'size', 'mtime_ns' (when known), 'name' and 'hash'
+        """
+        record = {"path": self.path, "size": self.size}
+        if self.mtime_ns is not None:
+            record["mtime_ns"] = self.mtime_ns
+        record["name"] = self.name
+        record["hash"] = self.hash
+        return record
+
+    @classmethod
+    def from_dict(cls, record: Dict[str, any]) -> "FileRecord":
+        """
+        Build a record from an index entry. Directory prefixes are interned,
+        so records loaded from the same directory share one string.
+
+        Args:
+            record (Dict): Entry with at least 'path'; 'hash' must already be
+                           raw digest bytes or None
+
+        Returns:
+            FileRecord: The record
+        """
+        path = record["path"]
+        name = record.get("name")
+        if not name or not path.endswith(name):
+            name = os.path.basename(path)
+
+        return cls(
+            dir_prefix=sys.intern(path[:len(path) - len(name)]),
+            name=name,
+            size=record.get("size", 0),
+            mtime_ns=record.get("mtime_ns"),
+            hash=record.get("hash"),
+        )
@@ -2,120 +2,744 @@
 File Scanner Module
 Handles recursive directory scanning and file indexing.
 """
+import asyncio
+import multiprocessing
 import os
+import queue
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import replace
+from functools import partial
+from itertools import chain
 from pathlib import Path
-from typing import List, Dict
+from typing import List
 
-from .hash_utils import generate_file_hash
+import config
+
+from .hash_cache import HashCache
+from .hash_utils import HEAD_SIZE, generate_head_hash
+from .io_uring_reader import hash_files
+from .records import FileRecord
+
+# Number of paths sent to a worker process per task; amortizes pickling.
+HASH_CHUNKSIZE = 32
+
+# A hashing stage runs in worker processes only from this many files or
+# bytes to read. Starting the pool takes about 0.4 s, while hashing a small
+# file inline takes ~50 us and BLAKE3 hashes several GB/s, so smaller
+# stages finish sooner on the calling thread.
+PARALLEL_MIN_FILES = 10_000
+PARALLEL_MIN_BYTES = 1 << 30
+
+# Threads used to walk top-level subdirectories; the walk is I/O-bound.
+WALK_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Seconds between progress updates while walking.
+PROGRESS_INTERVAL = 0.1
+
+
+def _map_each(function, items: list) -> list:
+    """Apply function to each item of a batch. Runs in a worker process."""
+    return [function(item) for item in items]
 
 
 class FileScanner:
     """Scanner class for recursively scanning directories and collecting file information."""
     
-    def __init__(self):
+    def __init__(self, max_workers: int = None, hash_cache_path: str = config.HASH_CACHE_PATH):
+        """
+        Args:
+            max_workers (int, optional): Number of worker processes used for
+                                         hashing. Defaults to the CPU count.
+                                         1 hashes inline without a pool, as
+                                         do stages below PARALLEL_MIN_FILES
+                                         files and PARALLEL_MIN_BYTES bytes.
+            hash_cache_path (str, optional): SQLite cache of hashes from
+                                             earlier scans. None disables
+                                             the cache.
+        """
         self.scanned_files = []
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.hash_cache_path = hash_cache_path
+        self._pending_files = []
+        self._files_found = 0
+        self._executor = None
     
-    def scan_directory(self, directory_path: str, progress_callback=None) -> List[Dict[str, any]]:
+    def scan_directory(self, directory_path: str, progress_callback=None) -> List[FileRecord]:
         """
         Recursively scan a directory and collect file information.
+
+        The directory tree is walked first, collecting stat information
+        only. Files whose size is unique cannot have a duplicate and are
+        never read; their 'hash' is None. The remaining files are filtered
+        by a 64-bit hash of their first 4 KiB (xxh3_64 when xxhash is
+        installed) and only files that still collide are fully hashed;
+        large stages run in parallel across worker processes. Files
+        unchanged since an earlier scan (same path, size and mtime) reuse
+        their cached hashes.
         
         Args:
             directory_path (str): Path to the directory to scan
             progress_callback (callable, optional): Callback function to report progress
             
         Returns:
-            List[Dict]: List of dictionaries containing file information
+            List[FileRecord]: Information about each file
         """
         self.scanned_files = []
+        self._pending_files = []
+        self._files_found = 0
         
-        # Validate directory
-        path = Path(directory_path)
-        if not path.exists():
-            raise ValueError(f"Directory does not exist: {directory_path}")
-        if not path.is_dir():
-            raise ValueError(f"Path is not a directory: {directory_path}")
+        self._check_directory(directory_path)
         
         # Start scanning
         if progress_callback:
             progress_callback("Starting scan...")
         
-        self._scan_recursive(path, progress_callback)
+        # Resolve the root once: scandir joins entry names onto the
+        # directory it was given, so every path below is absolute too
+        root = os.path.abspath(directory_path)
+        self._scan_tree(root, progress_callback)
+
+        if progress_callback:
+            progress_callback(f"Checking {len(self._pending_files)} files for duplicates...")
+
+        self._hash_pending_files(progress_callback)
         
         if progress_callback:
             progress_callback(f"Scan complete! Found {len(self.scanned_files)} files.")
         
         return self.scanned_files
     
-    def _scan_recursive(self, path: Path, progress_callback=None):
+    async def scan_directory_async(self, directory_path: str,
+                                   progress_callback=None) -> List[FileRecord]:
+        """
+        Awaitable version of scan_directory for use in an event loop.
+
+        Each blocking step is awaited on its own instead of running the
+        whole scan on one thread: every directory is listed by its own
+        asyncio.to_thread call, cache lookups and small hashing stages run
+        on the loop's default thread pool, and large hashing stages are
+        submitted to the worker processes batch by batch. A waiting scan
+        holds no thread, so many scans can share one event loop.
+        progress_callback is called on the event loop thread.
+
+        Args:
+            directory_path (str): Path to the directory to scan
+            progress_callback (callable, optional): Callback function to report progress
+
+        Returns:
+            List[FileRecord]: Information about each file
         """
-        Internal recursive method to scan directories.
+        self.scanned_files = []
+        self._pending_files = []
+        self._files_found = 0
+
+        await asyncio.to_thread(self._check_directory, directory_path)
+
+        if progress_callback:
+            progress_callback("Starting scan...")
+
+        root = os.path.abspath(directory_path)
+        await self._scan_tree_async(root, progress_callback)
+
+        if progress_callback:
+            progress_callback(f"Checking {len(self._pending_files)} files for duplicates...")
+
+        await self._hash_pending_files_async(progress_callback)
+
+        if progress_callback:
+            progress_callback(f"Scan complete! Found {len(self.scanned_files)} files.")
+
+        return self.scanned_files
+
+    @staticmethod
+    def _check_directory(directory_path: str):
+        """
+        Raise ValueError unless directory_path is an existing directory.
+
+        Args:
+            directory_path (str): Path to the directory to scan
+        """
+        path = Path(directory_path)
+        if not path.exists():
+            raise ValueError(f"Directory does not exist: {directory_path}")
+        if not path.is_dir():
+            raise ValueError(f"Path is not a directory: {directory_path}")
+
+    def _scan_tree(self, root: str, progress_callback=None):
+        """
+        Walk a directory tree, collecting stat information for every
+        regular file into _pending_files.
+
+        The root is listed on the calling thread and each top-level
+        subdirectory is walked on its own thread; os.scandir releases the
+        GIL while waiting on the disk. Worker threads collect into local
+        lists that are merged at the end, and send progress messages
+        through a queue that is drained on the calling thread.
         
         Args:
-            path (Path): Current path to scan
+            root (str): Absolute path of the directory to scan
             progress_callback (callable, optional): Callback function to report progress
         """
+        messages = queue.SimpleQueue()
+        report = messages.put if progress_callback else None
+
+        root_files = []
+        subdirectories = self._list_directory(root, root_files, report)
+
+        with ThreadPoolExecutor(max_workers=WALK_WORKERS) as executor:
+            futures = [
+                executor.submit(self._scan_subtree, subdirectory, report)
+                for subdirectory in subdirectories
+            ]
+
+            not_done = futures
+            while not_done:
+                _, not_done = wait(not_done, timeout=PROGRESS_INTERVAL)
+                if progress_callback:
+                    self._drain_progress(messages, progress_callback)
+
+        # Messages for root-level files, and any queued after the last
+        # wait, are still pending when there are no subdirectories
+        if progress_callback:
+            self._drain_progress(messages, progress_callback)
+
+        self._pending_files = list(chain(
+            root_files, chain.from_iterable(future.result() for future in futures)
+        ))
+
+    def _scan_subtree(self, root: str, report=None) -> List[FileRecord]:
+        """
+        Walk a directory tree breadth-first. Runs on a worker thread.
+
+        Args:
+            root (str): Directory to scan
+            report (callable, optional): Receives (message, is_file) progress tuples
+
+        Returns:
+            List[FileRecord]: Information about the files found
+        """
+        files = []
+        directories = deque([root])
+
+        while directories:
+            directories.extend(self._list_directory(directories.popleft(), files, report))
+
+        return files
+
+    async def _scan_tree_async(self, root: str, progress_callback=None):
+        """
+        Walk a directory tree breadth-first, collecting stat information
+        for every regular file into _pending_files.
+
+        Each directory is listed by its own asyncio.to_thread call, with up
+        to WALK_WORKERS listings in flight. Every listing collects into its
+        own list; the lists are merged in the order the directories were
+        found.
+
+        Args:
+            root (str): Absolute path of the directory to scan
+            progress_callback (callable, optional): Callback function to report progress
+        """
+        messages = queue.SimpleQueue()
+        report = messages.put if progress_callback else None
+
+        listings = []
+        directories = deque([root])
+        running = set()
+
         try:
-            # Iterate through all items in the directory
-            for item in path.iterdir():
-                try:
-                    # Skip if it's a directory, recursively scan it
-                    if item.is_dir():
-                        self._scan_recursive(item, progress_callback)
-                    # If it's a file, collect its information
-                    elif item.is_file():
-                        if progress_callback:
-                            progress_callback(f"Scanning: {item}")
-
-                        file_info = self._collect_file_info(item)
-                        if file_info is not None:
-                            self.scanned_files.append(file_info)
-                        
-                        # Report progress every 100 files
-                        if progress_callback and len(self.scanned_files) % 100 == 0:
-                            progress_callback(f"Files found: {len(self.scanned_files)}")
-                
-                except (PermissionError, OSError) as e:
-                    # Skip files/folders we can't access
-                    if progress_callback:
-                        progress_callback(f"Skipped (no permission): {item}")
-                    continue
-        
-        except (PermissionError, OSError) as e:
+            while directories or running:
+                while directories and len(running) < WALK_WORKERS:
+                    files = []
+                    listings.append(files)
+                    running.add(asyncio.ensure_future(asyncio.to_thread(
+                        self._list_directory, directories.popleft(), files, report
+                    )))
+
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for listing in done:
+                    directories.extend(listing.result())
+
+                if progress_callback:
+                    self._drain_progress(messages, progress_callback)
+        finally:
+            for listing in running:
+                listing.cancel()
+
+        self._pending_files = list(chain.from_iterable(listings))
+
+    def _list_directory(self, directory: str, files: list, report=None) -> List[str]:
+        """
+        List one directory, appending information about its files to files.
+
+        os.scandir caches the file type from readdir, so is_dir() and
+        is_file() need no extra syscalls. Symlinks are not followed.
+
+        Args:
+            directory (str): Absolute path of the directory to list
+            files (list): List receiving FileRecords
+            report (callable, optional): Receives (message, is_file) progress tuples
+
+        Returns:
+            List[str]: Paths of the subdirectories
+        """
+        subdirectories = []
+        dir_prefix = os.path.join(directory, "")
+
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        # Queue subdirectories for scanning
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirectories.append(entry.path)
+                        # If it's a file, collect its information
+                        elif entry.is_file(follow_symlinks=False):
+                            if report:
+                                report((f"Scanning: {entry.path}", True))
+
+                            record = self._collect_file_info(entry, dir_prefix)
+                            if record is not None:
+                                files.append(record)
+
+                    except (PermissionError, OSError):
+                        # Skip files/folders we can't access
+                        if report:
+                            report((f"Skipped (no permission): {entry.path}", False))
+
+        except (PermissionError, OSError):
             # Skip directories we can't access
-            if progress_callback:
-                progress_callback(f"Skipped directory (no permission): {path}")
+            if report:
+                report((f"Skipped directory (no permission): {directory}", False))
+
+        return subdirectories
+
+    def _drain_progress(self, messages: queue.SimpleQueue, progress_callback):
+        """
+        Forward queued progress messages from the walker threads.
+        
+        Args:
+            messages (queue.SimpleQueue): Queue of (message, is_file) tuples
+            progress_callback (callable): Callback function to report progress
+        """
+        while True:
+            try:
+                message, is_file = messages.get_nowait()
+            except queue.Empty:
+                return
+
+            progress_callback(message)
+
+            if is_file:
+                self._files_found += 1
+                # Report progress every 100 files
+                if self._files_found % 100 == 0:
+                    progress_callback(f"Files found: {self._files_found}")
     
-    def _collect_file_info(self, file_path: Path) -> Dict[str, any]:
+    def _collect_file_info(self, entry: os.DirEntry, dir_prefix: str) -> FileRecord:
         """
-        Collect information about a file.
+        Collect stat information about a file. The hash is filled in later
+        by _hash_pending_files.
         
         Args:
-            file_path (Path): Path to the file
+            entry (os.DirEntry): Directory entry of the file
+            dir_prefix (str): Absolute path of the entry's directory, ending
+                              with a separator; shared by its files
             
         Returns:
-            Dict: Dictionary containing file information
+            FileRecord: Information about the file
         """
         try:
-            file_stats = file_path.stat()
-            file_hash = generate_file_hash(str(file_path))
-
-            if not file_hash:
-                return None
-
-            return {
-                "path": str(file_path.absolute()),
-                "size": file_stats.st_size,
-                "name": file_path.name,
-                "hash": file_hash,
-            }
+            file_stats = entry.stat(follow_symlinks=False)
+
+            return FileRecord(
+                dir_prefix=dir_prefix,
+                name=entry.name,
+                size=file_stats.st_size,
+                mtime_ns=file_stats.st_mtime_ns,
+            )
         except (OSError, PermissionError):
             return None
+
+    def _hash_pending_files(self, progress_callback=None):
+        """
+        Hash the collected files that may have duplicates and move all
+        collected files into scanned_files, keeping walk order.
+        Files that cannot be read are dropped.
+        
+        Args:
+            progress_callback (callable, optional): Callback function to report progress
+        """
+        cache = self._open_cache()
+        hashes = [None] * len(self._pending_files)
+
+        try:
+            to_hash, head_candidates, cached_keys = self._find_candidates(cache, hashes)
+
+            if progress_callback:
+                progress_callback(f"Comparing file heads: {len(head_candidates)} files")
+
+            cached, to_read = self._cached_head_hashes(cache, head_candidates)
+            head_hashes = self._map_batches(
+                partial(_map_each, generate_head_hash), to_read, len(to_read) * HEAD_SIZE
+            )
+            head_results = cached + self._store_head_hashes(cache, to_read, head_hashes)
+            to_hash.extend(self._match_heads(head_results, hashes, cached_keys))
+
+            if progress_callback:
+                progress_callback(f"Hashing {len(to_hash)} files...")
+
+            full_hashes = self._map_batches(hash_files, to_hash, self._total_size(to_hash))
+            self._store_hashes(cache, to_hash, full_hashes, hashes, progress_callback)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+            if cache is not None:
+                cache.close()
+
+        self._finish_hashing(hashes)
+
+    async def _hash_pending_files_async(self, progress_callback=None):
+        """
+        Awaitable version of _hash_pending_files. Each stage is awaited on
+        its own; see scan_directory_async.
+
+        Args:
+            progress_callback (callable, optional): Callback function to report progress
+        """
+        cache = await asyncio.to_thread(self._open_cache)
+        hashes = [None] * len(self._pending_files)
+
+        try:
+            to_hash, head_candidates, cached_keys = await asyncio.to_thread(
+                self._find_candidates, cache, hashes
+            )
+
+            if progress_callback:
+                progress_callback(f"Comparing file heads: {len(head_candidates)} files")
+
+            cached, to_read = await asyncio.to_thread(
+                self._cached_head_hashes, cache, head_candidates
+            )
+            head_hashes = await self._map_batches_async(
+                partial(_map_each, generate_head_hash), to_read, len(to_read) * HEAD_SIZE
+            )
+            head_results = cached + await asyncio.to_thread(
+                self._store_head_hashes, cache, to_read, head_hashes
+            )
+            to_hash.extend(await asyncio.to_thread(
+                self._match_heads, head_results, hashes, cached_keys
+            ))
+
+            if progress_callback:
+                progress_callback(f"Hashing {len(to_hash)} files...")
+
+            full_hashes = await self._map_batches_async(
+                hash_files, to_hash, self._total_size(to_hash), progress_callback
+            )
+            await asyncio.to_thread(self._store_hashes, cache, to_hash, full_hashes, hashes)
+        finally:
+            if self._executor is not None:
+                executor, self._executor = self._executor, None
+                await asyncio.to_thread(executor.shutdown, cancel_futures=True)
+            if cache is not None:
+                await asyncio.to_thread(cache.close)
+
+        await asyncio.to_thread(self._finish_hashing, hashes)
+
+    def _open_cache(self):
+        """Open the hash cache, or return None if it is disabled."""
+        if not self.hash_cache_path:
+            return None
+        return HashCache(self.hash_cache_path, config.HASH_CACHE_MAX_AGE_DAYS)
+
+    def _find_candidates(self, cache, hashes: list):
+        """
+        Find the pending files that may have duplicates. Files unchanged
+        since an earlier scan get their cached hash instead.
+
+        Args:
+            cache (HashCache or None): Cache of earlier hashes
+            hashes (list): Hash per pending file; cached hashes are filled in
+
+        Returns:
+            Tuple[List[int], List[int], Tuple[set, set]]: Positions of the
+            files to hash fully, positions of the files to compare by head
+            hash first, and the (size, head hash) pairs and sizes (for
+            files without a cached head hash) of the cached files.
+        """
+        files = self._pending_files
+
+        # Only files sharing their size with another file can be duplicates
+        size_groups = defaultdict(list)
+        for index, record in enumerate(files):
+            size_groups[record.size].append(index)
+
+        candidates = [
+            index for group in size_groups.values() if len(group) > 1
+            for index in group
+        ]
+
+        # Reuse hashes of files unchanged since an earlier scan. Other
+        # files may still match a cached one: they are fully hashed if
+        # they share its (size, head hash), or just its size when its
+        # head hash is not cached.
+        cached_heads = set()
+        cached_sizes = set()
+        if cache is not None:
+            uncached = []
+            for index in candidates:
+                record = files[index]
+                key = (record.path, record.size, record.mtime_ns)
+                hashes[index] = cache.get(*key)
+                if hashes[index] is None:
+                    uncached.append(index)
+                    continue
+
+                head_hash = cache.get_head(*key)
+                if head_hash is None:
+                    cached_sizes.add(record.size)
+                else:
+                    cached_heads.add((record.size, head_hash))
+            candidates = uncached
+
+        # Files no larger than the head are read completely either way,
+        # so they skip the head stage
+        to_hash = [index for index in candidates if files[index].size <= HEAD_SIZE]
+        head_candidates = [index for index in candidates if files[index].size > HEAD_SIZE]
+
+        return to_hash, head_candidates, (cached_heads, cached_sizes)
+
+    def _cached_head_hashes(self, cache, indices):
+        """
+        Look up the head hashes of pending files in the cache.
+
+        Args:
+            cache (HashCache or None): Cache of earlier hashes
+            indices (List[int]): Positions of the files in _pending_files
+
+        Returns:
+            Tuple[List[Tuple[int, int]], List[int]]: (index, head hash)
+            pairs of the cached files, and the positions of the others.
+        """
+        if cache is None:
+            return [], list(indices)
+
+        files = self._pending_files
+        results = []
+        to_read = []
+
+        for index in indices:
+            record = files[index]
+            head_hash = cache.get_head(record.path, record.size, record.mtime_ns)
+            if head_hash is None:
+                to_read.append(index)
+            else:
+                results.append((index, head_hash))
+
+        return results, to_read
+
+    def _store_head_hashes(self, cache, indices, head_hashes):
+        """
+        Add newly computed head hashes to the cache.
+
+        Args:
+            cache (HashCache or None): Cache of earlier hashes
+            indices (List[int]): Positions of the files in _pending_files
+            head_hashes (Iterable[int]): Head hash per index; None for
+                                         unreadable files
+
+        Returns:
+            List[Tuple[int, int]]: (index, head hash) pairs
+        """
+        files = self._pending_files
+        results = []
+
+        for index, head_hash in zip(indices, head_hashes):
+            if cache is not None and head_hash is not None:
+                record = files[index]
+                cache.put_head(record.path, record.size, record.mtime_ns, head_hash)
+            results.append((index, head_hash))
+
+        return results
+
+    def _match_heads(self, head_results, hashes: list, cached_keys) -> List[int]:
+        """
+        Regroup the head candidates by (size, hash of the first 4 KiB).
+
+        Args:
+            head_results (List[Tuple[int, int]]): (index, head hash) pairs
+            hashes (list): Hash per pending file; unreadable files are
+                           marked with b""
+            cached_keys (Tuple[set, set]): Keys of cached files, from
+                                           _find_candidates
+
+        Returns:
+            List[int]: Positions of the files that still may have a duplicate
+        """
+        files = self._pending_files
+        cached_heads, cached_sizes = cached_keys
+
+        head_groups = defaultdict(list)
+        for index, head_hash in head_results:
+            if head_hash is None:
+                hashes[index] = b""
+                continue
+            head_groups[(files[index].size, head_hash)].append(index)
+
+        return [
+            index for key, group in head_groups.items()
+            if len(group) > 1 or key in cached_heads or key[0] in cached_sizes
+            for index in group
+        ]
+
+    def _store_hashes(self, cache, indices, full_hashes, hashes: list, progress_callback=None):
+        """
+        Record newly computed digests, and add them to the cache.
+
+        Args:
+            cache (HashCache or None): Cache of earlier hashes
+            indices (List[int]): Positions of the files in _pending_files
+            full_hashes (Iterable[bytes]): Digest per index; b"" for
+                                           unreadable files
+            hashes (list): Hash per pending file
+            progress_callback (callable, optional): Callback function to report progress
+        """
+        files = self._pending_files
+
+        for count, (index, file_hash) in enumerate(zip(indices, full_hashes), 1):
+            hashes[index] = file_hash
+            if cache is not None and file_hash:
+                record = files[index]
+                cache.put(record.path, record.size, record.mtime_ns, file_hash)
+
+            # Report progress every 100 files
+            if progress_callback and count % 100 == 0:
+                progress_callback(f"Files hashed: {count}")
+
+    def _finish_hashing(self, hashes: list):
+        """
+        Move the pending files into scanned_files with their hashes.
+
+        Args:
+            hashes (list): Hash per pending file
+        """
+        # Empty bytes mark a file that could not be read; None means
+        # the file was never hashed because it cannot have a duplicate.
+        self.scanned_files = [
+            record if file_hash is None else replace(record, hash=file_hash)
+            for record, file_hash in zip(self._pending_files, hashes)
+            if file_hash != b""
+        ]
+        self._pending_files = []
+
+    def _total_size(self, indices) -> int:
+        """Return the combined size of pending files."""
+        return sum(self._pending_files[index].size for index in indices)
+
+    def _batches(self, indices) -> List[List[str]]:
+        """Split the paths of pending files into batches of HASH_CHUNKSIZE."""
+        paths = [self._pending_files[index].path for index in indices]
+        return [
+            paths[start:start + HASH_CHUNKSIZE]
+            for start in range(0, len(paths), HASH_CHUNKSIZE)
+        ]
+
+    def _map_batches(self, batch_function, indices, total_bytes: int):
+        """
+        Apply a batch hash function to the paths of pending files in
+        batches of HASH_CHUNKSIZE, in order.
+        
+        Args:
+            batch_function (callable): Function taking a list of path strings
+                                       and returning a list of hashes
+            indices (List[int]): Positions of the files in _pending_files
+            total_bytes (int): Number of bytes the function will read
+            
+        Returns:
+            Iterator: Hashes matching indices
+        """
+        batches = self._batches(indices)
+        executor = self._executor_for(len(indices), total_bytes)
+
+        if executor is None:
+            return chain.from_iterable(map(batch_function, batches))
+        return chain.from_iterable(executor.map(batch_function, batches))
+
+    async def _map_batches_async(self, batch_function, indices, total_bytes: int,
+                                 progress_callback=None) -> list:
+        """
+        Awaitable version of _map_batches. Stages large enough for the
+        worker pool are submitted batch by batch; smaller ones run on the
+        loop's default thread pool.
+
+        Args:
+            batch_function (callable): Function taking a list of path strings
+                                       and returning a list of hashes
+            indices (List[int]): Positions of the files in _pending_files
+            total_bytes (int): Number of bytes the function will read
+            progress_callback (callable, optional): Receives the number of
+                                                    files hashed, every
+                                                    100 files or so
+
+        Returns:
+            list: Hashes matching indices
+        """
+        batches = self._batches(indices)
+        executor = self._executor_for(len(indices), total_bytes)
+
+        if executor is None:
+            results = await asyncio.to_thread(lambda: list(map(batch_function, batches)))
+            return list(chain.from_iterable(results))
+
+        loop = asyncio.get_running_loop()
+        futures = [loop.run_in_executor(executor, batch_function, batch) for batch in batches]
+
+        if progress_callback:
+            count = 0
+            for finished in asyncio.as_completed(futures):
+                batch_hashes = await finished
+                if (count + len(batch_hashes)) // 100 > count // 100:
+                    progress_callback(f"Files hashed: {count + len(batch_hashes)}")
+                count += len(batch_hashes)
+
+        return list(chain.from_iterable(await asyncio.gather(*futures)))
+
+    def _executor_for(self, file_count: int, total_bytes: int):
+        """
+        Get the worker pool for a hashing stage, or None if the stage is
+        small enough to run inline. The pool is started by the first stage
+        that needs it and shared by later ones.
+
+        Args:
+            file_count (int): Number of files the stage reads
+            total_bytes (int): Number of bytes the stage reads
+
+        Returns:
+            ProcessPoolExecutor or None: Pool to run on, or None to run inline
+        """
+        if self.max_workers <= 1:
+            return None
+        if file_count < PARALLEL_MIN_FILES and total_bytes < PARALLEL_MIN_BYTES:
+            return None
+
+        if self._executor is None:
+            # Workers are spawned, not forked: forking a process whose hasher
+            # already started a thread pool (BLAKE3 uses one for large files)
+            # deadlocks the children.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
     
     def get_file_count(self) -> int:
         """
-        Get the total number of files scanned.
+        Get the total number of files found so far.
         
         Returns:
             int: Number of files
         """
-        return len(self.scanned_files)
+        return len(self.scanned_files) or len(self._pending_files) or self._files_found
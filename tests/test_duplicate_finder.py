@@ -0,0 +1,37 @@
+"""
+Tests for duplicate detection.
+Run from the project root: python -m unittest discover -s tests -t .
+"""
+import unittest
+
+from scanner.columns import NUMPY_AVAILABLE, to_columns
+from scanner.duplicate_finder import find_duplicates
+from scanner.index_store import LEGACY_HASH_ALGO, decode_hash
+from scanner.records import FileRecord
+
+
+def legacy_records(count):
+    """Records loaded from an index of another algorithm, all distinct
+    except for the last two."""
+    records = []
+    for index in range(count):
+        digest = min(index, count - 2).to_bytes(32, "big")
+        records.append(FileRecord(
+            "/a/", f"file{index}", 100,
+            hash=decode_hash(f"{LEGACY_HASH_ALGO}:{digest.hex()}")
+        ))
+    return records
+
+
+class ForeignAlgorithmTest(unittest.TestCase):
+    def test_dict_path_finds_only_real_duplicates(self):
+        self.assertEqual(find_duplicates(legacy_records(1000)), [["/a/file998", "/a/file999"]])
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "numpy not installed")
+    def test_columns_path_matches_dict_path(self):
+        records = legacy_records(1000)
+        self.assertEqual(find_duplicates(to_columns(records)), find_duplicates(records))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Tests for the persistent hash cache and its use by FileScanner.
+Run from the project root: python -m unittest discover -s tests -t .
+"""
+import os
+import tempfile
+import unittest
+
+from scanner import FileScanner, find_duplicates
+from scanner.hash_cache import HashCache
+from scanner.hash_utils import HEAD_SIZE
+
+DIGEST = bytes(range(32))
+HEAD = (1 << 64) - 1
+
+
+class HashCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = HashCache(os.path.join(self.directory.name, "cache.sqlite"))
+
+    def tearDown(self):
+        self.cache.close()
+        self.directory.cleanup()
+
+    def test_changed_mtime_misses(self):
+        self.cache.put("/a", 10, 1, DIGEST)
+        self.cache.flush()
+
+        self.assertEqual(self.cache.get("/a", 10, 1), DIGEST)
+        self.assertIsNone(self.cache.get("/a", 10, 2))
+
+    def test_put_head_then_put_keeps_both(self):
+        self.cache.put_head("/a", 10, 1, HEAD)
+        self.cache.put("/a", 10, 1, DIGEST)
+        self.cache.flush()
+
+        self.assertEqual(self.cache.get_head("/a", 10, 1), HEAD)
+        self.assertEqual(self.cache.get("/a", 10, 1), DIGEST)
+
+    def test_put_for_changed_file_drops_head(self):
+        self.cache.put_head("/a", 10, 1, HEAD)
+        self.cache.put("/a", 10, 2, DIGEST)
+        self.cache.flush()
+
+        self.assertIsNone(self.cache.get_head("/a", 10, 2))
+        self.assertEqual(self.cache.get("/a", 10, 2), DIGEST)
+
+
+class ScannerCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.directory.name, "files")
+        os.mkdir(self.root)
+        self.cache_path = os.path.join(self.directory.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, content, mtime_ns=None):
+        path = os.path.join(self.root, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+        return path
+
+    def scan(self):
+        """Scan the test directory; return the records and the progress
+        messages of the hashing stages."""
+        messages = []
+        scanner = FileScanner(max_workers=1, hash_cache_path=self.cache_path)
+        files = scanner.scan_directory(self.root, messages.append)
+        stages = [m for m in messages if m.startswith(("Comparing", "Hashing"))]
+        return files, stages
+
+    def test_rescan_reuses_cached_digests(self):
+        self.write("a", b"same")
+        self.write("b", b"same")
+
+        first, stages = self.scan()
+        self.assertIn("Hashing 2 files...", stages)
+
+        second, stages = self.scan()
+        self.assertIn("Hashing 0 files...", stages)
+        self.assertEqual(second, first)
+
+    def test_same_size_rewrite_is_rehashed(self):
+        self.write("a", b"same", mtime_ns=1_000_000_000)
+        self.write("b", b"same", mtime_ns=1_000_000_000)
+        files, _ = self.scan()
+        self.assertEqual(len(find_duplicates(files)), 1)
+
+        self.write("a", b"diff", mtime_ns=2_000_000_000)
+        files, stages = self.scan()
+
+        self.assertIn("Hashing 1 files...", stages)
+        self.assertEqual(find_duplicates(files), [])
+
+    def test_new_file_matching_cached_head_is_fully_hashed(self):
+        content = os.urandom(HEAD_SIZE * 2)
+        self.write("a", content)
+        self.write("b", content)
+        self.scan()
+
+        # c has no same-size partner among the uncached files, only the
+        # cached head of a and b; d differs within its head
+        self.write("c", content)
+        self.write("d", bytes(len(content)))
+        files, stages = self.scan()
+
+        self.assertEqual(stages, ["Comparing file heads: 2 files", "Hashing 1 files..."])
+        groups = [sorted(group) for group in find_duplicates(files)]
+        self.assertEqual(groups, [[os.path.join(self.root, name) for name in "abc"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
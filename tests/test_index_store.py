@@ -0,0 +1,63 @@
+"""
+Tests for the file index storage.
+Run from the project root: python -m unittest discover -s tests -t .
+"""
+import os
+import tempfile
+import unittest
+
+from scanner import index_store
+from scanner.hash_utils import HASH_ALGO
+from scanner.records import FileRecord
+
+DIGEST = bytes(range(32))
+
+
+class HashEncodingTest(unittest.TestCase):
+    def test_current_algorithm_round_trips(self):
+        self.assertEqual(index_store.decode_hash(index_store.encode_hash(DIGEST)), DIGEST)
+
+    def test_untagged_digest_is_legacy_algorithm(self):
+        tagged = f"{index_store.LEGACY_HASH_ALGO}:{DIGEST.hex()}"
+        self.assertEqual(index_store.decode_hash(DIGEST.hex()), index_store.decode_hash(tagged))
+
+    def test_other_algorithm_never_matches_current(self):
+        other = "xxh3_128" if HASH_ALGO != "xxh3_128" else "blake3"
+        self.assertNotEqual(index_store.decode_hash(f"{other}:{DIGEST.hex()}"), DIGEST)
+
+
+class SaveIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.index_path = self.directory.name
+        self.records = [
+            FileRecord("/a/", "small", 10, hash=DIGEST),
+            FileRecord("/b/", "large", 1 << 20, hash=DIGEST[::-1]),
+        ]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_resave_replaces_previous_shards(self):
+        index_store.save_index(self.records, self.index_path)
+        index_store.save_index(self.records[:1], self.index_path)
+
+        self.assertEqual(list(index_store.iter_index(self.index_path)), self.records[:1])
+        self.assertEqual(len(os.listdir(self.index_path)), 2)
+
+    def test_failed_save_keeps_previous_index(self):
+        index_store.save_index(self.records, self.index_path)
+
+        def failing_records():
+            yield self.records[0]
+            raise OSError("disk full")
+
+        with self.assertRaises(OSError):
+            index_store.save_index(failing_records(), self.index_path)
+
+        self.assertEqual(list(index_store.iter_index(self.index_path)), self.records)
+        self.assertEqual(len(os.listdir(self.index_path)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
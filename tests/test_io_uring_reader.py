@@ -0,0 +1,50 @@
+"""
+Tests for the io_uring file reader.
+Run from the project root: python -m unittest discover -s tests -t .
+"""
+import os
+import tempfile
+import types
+import unittest
+
+from scanner import io_uring_reader
+from scanner.hash_utils import generate_file_hash
+
+
+class BindingApiTest(unittest.TestCase):
+    def test_binding_without_required_names_is_rejected(self):
+        self.assertFalse(io_uring_reader._binding_supports_api(types.SimpleNamespace()))
+
+
+@unittest.skipUnless(io_uring_reader.IO_URING_AVAILABLE,
+                     "liburing (2024.x) or io_uring kernel support not available")
+class IoUringHashTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.paths = []
+        # Empty, sub-buffer, multi-read and several same-content files
+        contents = [b"", b"abc", os.urandom(io_uring_reader.READ_SIZE * 3 + 17), b"abc"]
+        contents += [bytes([index]) * 5000 for index in range(io_uring_reader.QUEUE_DEPTH + 5)]
+        for index, content in enumerate(contents):
+            path = os.path.join(self.directory.name, f"file{index}")
+            with open(path, "wb") as f:
+                f.write(content)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_ring_matches_single_file_hashing(self):
+        results = dict(io_uring_reader._hash_files_uring(list(enumerate(self.paths))))
+        expected = [generate_file_hash(path) for path in self.paths]
+        self.assertEqual([results[index] for index in range(len(self.paths))], expected)
+
+    def test_hash_files_marks_missing_files(self):
+        paths = self.paths[:3] + [os.path.join(self.directory.name, "missing")]
+        hashes = io_uring_reader.hash_files(paths)
+        self.assertEqual(hashes[:3], [generate_file_hash(path) for path in paths[:3]])
+        self.assertEqual(hashes[3], b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
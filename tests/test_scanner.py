@@ -0,0 +1,59 @@
+"""
+Tests for FileScanner.
+Run from the project root: python -m unittest discover -s tests -t .
+"""
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+
+from scanner import FileScanner
+from scanner.hash_utils import HEAD_SIZE
+
+
+class AsyncScanTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        root = self.directory.name
+        os.makedirs(os.path.join(root, "a", "b"))
+        large = os.urandom(HEAD_SIZE * 2)
+        contents = {
+            "small1": b"same", "a/small2": b"same", "a/b/small3": b"other",
+            "large1": large, "a/b/large2": large, "a/large3": bytes(len(large)),
+        }
+        for name, content in contents.items():
+            with open(os.path.join(root, name), "wb") as f:
+                f.write(content)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_matches_sync_scan(self):
+        expected = FileScanner(max_workers=1, hash_cache_path=None).scan_directory(self.directory.name)
+
+        loop_thread = []
+        callback_threads = set()
+
+        def progress(message):
+            callback_threads.add(threading.get_ident())
+
+        async def scan():
+            loop_thread.append(threading.get_ident())
+            scanner = FileScanner(max_workers=1, hash_cache_path=None)
+            return await scanner.scan_directory_async(self.directory.name, progress)
+
+        files = asyncio.run(scan())
+
+        self.assertEqual(sorted(files, key=str), sorted(expected, key=str))
+        self.assertEqual(callback_threads, set(loop_thread))
+
+    def test_missing_directory_raises(self):
+        scanner = FileScanner(max_workers=1, hash_cache_path=None)
+        missing = os.path.join(self.directory.name, "missing")
+        with self.assertRaises(ValueError):
+            asyncio.run(scanner.scan_directory_async(missing))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1 +1 @@
-"""UI package for Flask web interface."""
+"""UI package for the Quart web interface."""
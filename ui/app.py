@@ -1,61 +1,127 @@
 """
-Flask Web UI for SmartStorage
+Quart Web UI for SmartStorage
 Provides a web interface for scanning and viewing file index.
+Runs on asyncio: scans are tasks on the event loop, not dedicated threads,
+and several scans can run at once.
 """
-from flask import Flask, render_template, request, jsonify
+from quart import Quart, Response, render_template, request, jsonify
+from dataclasses import asdict, dataclass, replace
+import asyncio
+import itertools
 import json
 import os
 import sys
 from pathlib import Path
-from threading import Thread
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scanner import FileScanner
-from scanner.duplicate_finder import find_duplicates, calculate_wasted_space
+from scanner.duplicate_finder import group_duplicate_records
+from scanner.human import format_size
+from scanner.index_store import count_index, read_index_page, save_index
 import config
 
-app = Flask(__name__)
+app = Quart(__name__)
+
+# Page size for /api/files
+FILES_PAGE_SIZE = 1000
+MAX_FILES_PAGE_SIZE = 10000
+
+# Seconds between keep-alive comments on an idle /api/scan-stream
+STREAM_KEEPALIVE = 15
+
+# Number of finished scans whose status and duplicates are kept
+FINISHED_SCANS_KEPT = 16
 
-# Global variables to track scan status
-scan_status = {
-    "is_scanning": False,
-    "progress_message": "",
-    "files_found": 0
-}
 
-# Global variable to store duplicate results
-duplicate_results = {
+@dataclass(frozen=True)
+class ScanStatus:
+    """Immutable snapshot of the scan progress."""
+    is_scanning: bool = False
+    progress_message: str = ""
+    files_found: int = 0
+
+
+# Duplicate results of a scan that has not finished
+NO_DUPLICATES = {
     "groups": [],
     "total_duplicate_files": 0,
     "wasted_space_bytes": 0
 }
 
 
+class Scan:
+    """
+    State of one scan. Status snapshots are replaced, never mutated, and
+    only on the event loop thread. Every replacement sets changed, waking
+    all open status streams, and swaps in a fresh event for the next change.
+    """
+
+    def __init__(self, scan_id: int, directory: str):
+        self.scan_id = scan_id
+        self.directory = directory
+        self.status = ScanStatus(is_scanning=True, progress_message="Starting scan...")
+        self.changed = asyncio.Event()
+        self.duplicates = NO_DUPLICATES
+
+    def update(self, **changes):
+        """
+        Publish a new status snapshot.
+
+        Args:
+            **changes: ScanStatus fields to change
+        """
+        self.status = replace(self.status, **changes)
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+
+# Scans by id, oldest first; the event loop only keeps weak references to
+# tasks, so running scan tasks are held in scan_tasks.
+scans = {}
+scan_tasks = set()
+scan_ids = itertools.count(1)
+
+# Scans write the same index, one at a time; the last to finish wins
+index_lock = asyncio.Lock()
+
+
+def get_scan():
+    """
+    Find the scan selected by the 'scan_id' query parameter, or the most
+    recently started scan if there is none.
+
+    Returns:
+        Scan or None: The scan, or None if it is unknown
+    """
+    scan_id = request.args.get('scan_id', type=int)
+    if scan_id is None:
+        return scans[next(reversed(scans))] if scans else None
+    return scans.get(scan_id)
+
+
+def forget_finished_scans():
+    """Drop the oldest finished scans beyond FINISHED_SCANS_KEPT."""
+    finished = [scan_id for scan_id, scan in scans.items() if not scan.status.is_scanning]
+    for scan_id in finished[:-FINISHED_SCANS_KEPT]:
+        del scans[scan_id]
+
+
 @app.route('/')
-def index():
+async def index():
     """Render the main page."""
-    return render_template('index.html')
+    return await render_template('index.html')
 
 
 @app.route('/api/start-scan', methods=['POST'])
-def start_scan():
+async def start_scan():
     """
     API endpoint to start a directory scan.
     Expects JSON body with 'directory' field.
     """
-    global scan_status
-    
-    # Check if already scanning
-    if scan_status["is_scanning"]:
-        return jsonify({
-            "success": False,
-            "message": "Scan already in progress"
-        }), 400
-    
     # Get directory from request
-    data = request.get_json()
+    data = await request.get_json()
     directory = data.get('directory', '')
     
     if not directory:
@@ -77,46 +143,104 @@ def start_scan():
             "message": f"Path is not a directory: {directory}"
         }), 400
     
-    # Start scan in background thread
-    thread = Thread(target=perform_scan, args=(directory,))
-    thread.start()
+    forget_finished_scans()
+    scan = Scan(next(scan_ids), directory)
+    scans[scan.scan_id] = scan
+    
+    # Start scan as a background task
+    task = asyncio.create_task(perform_scan(scan))
+    scan_tasks.add(task)
+    task.add_done_callback(scan_tasks.discard)
     
     return jsonify({
         "success": True,
-        "message": "Scan started"
+        "message": "Scan started",
+        "scan_id": scan.scan_id
     })
 
 
 @app.route('/api/scan-status', methods=['GET'])
-def get_scan_status():
+async def get_scan_status():
+    """
+    API endpoint to get the status of a scan.
+    Accepts an optional 'scan_id' query parameter; defaults to the latest scan.
     """
-    API endpoint to get current scan status.
+    scan = get_scan()
+    if scan is None:
+        return jsonify(asdict(ScanStatus()))
+    return jsonify(asdict(scan.status))
+
+
+@app.route('/api/scan-stream', methods=['GET'])
+async def scan_stream():
     """
-    return jsonify(scan_status)
+    Server-sent events endpoint pushing the status of a scan whenever it
+    changes. Accepts an optional 'scan_id' query parameter; defaults to the
+    latest scan. The stream ends after sending a status with is_scanning
+    false.
+    """
+    scan = get_scan()
+
+    async def events():
+        while True:
+            if scan is None:
+                yield f"data: {json.dumps(asdict(ScanStatus()))}\n\n"
+                return
+
+            # Take the event before sending, so no change is missed
+            changed = scan.changed
+            status = scan.status
+            yield f"data: {json.dumps(asdict(status))}\n\n"
+            
+            if not status.is_scanning:
+                return
+            
+            while True:
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=STREAM_KEEPALIVE)
+                    break
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+    
+    response = Response(
+        events(),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    # The stream lasts as long as the scan
+    response.timeout = None
+    return response
 
 
 @app.route('/api/files', methods=['GET'])
-def get_files():
+async def get_files():
     """
-    API endpoint to get the list of scanned files from the index.
+    API endpoint to get a page of scanned files from the index.
+    Accepts optional 'offset' and 'limit' query parameters.
     """
+    offset = max(request.args.get('offset', default=0, type=int), 0)
+    limit = min(max(request.args.get('limit', default=FILES_PAGE_SIZE, type=int), 0),
+                MAX_FILES_PAGE_SIZE)
+
     try:
-        # Check if index file exists
-        if not os.path.exists(config.INDEX_FILE_PATH):
+        # Check if the index exists
+        if not os.path.exists(config.INDEX_DIR_PATH):
             return jsonify({
                 "success": True,
                 "total_files": 0,
+                "offset": offset,
                 "files": []
             })
         
-        # Read the index file
-        with open(config.INDEX_FILE_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # Read only the requested page of the index
+        files = await asyncio.to_thread(read_index_page, config.INDEX_DIR_PATH, offset, limit)
+        total_files = await asyncio.to_thread(count_index, config.INDEX_DIR_PATH)
         
         return jsonify({
             "success": True,
-            "total_files": data.get("total_files", 0),
-            "files": data.get("files", [])
+            "total_files": total_files,
+            "offset": offset,
+            "files": files
         })
     
     except Exception as e:
@@ -126,78 +250,71 @@ def get_files():
         }), 500
 
 
-def perform_scan(directory: str):
+async def perform_scan(scan: Scan):
     """
     Perform the actual directory scan.
-    Runs in a background thread.
+    Runs as a background task on the event loop.
     
     Args:
-        directory (str): Directory path to scan
+        scan (Scan): The scan to run
     """
-    global scan_status
-    
+    # Also reported if the task is cancelled
+    message = "Scan cancelled."
     try:
-        # Set scanning status
-        scan_status["is_scanning"] = True
-        scan_status["progress_message"] = "Starting scan..."
-        scan_status["files_found"] = 0
-        
         # Create scanner and start scanning
         scanner = FileScanner()
         
         def progress_callback(message: str):
             """Update progress status."""
-            scan_status["progress_message"] = message
-            scan_status["files_found"] = scanner.get_file_count()
+            scan.update(
+                progress_message=message,
+                files_found=scanner.get_file_count()
+            )
         
-        files = scanner.scan_directory(directory, progress_callback=progress_callback)
+        files = await scanner.scan_directory_async(scan.directory, progress_callback=progress_callback)
         
-        # Save to JSON
-        scan_status["progress_message"] = "Saving index..."
-        save_index_to_json(files)
+        # Save the index
+        scan.update(progress_message="Saving index...")
+        async with index_lock:
+            await asyncio.to_thread(save_index, files, config.INDEX_DIR_PATH)
 
         # Find duplicates
-        scan_status["progress_message"] = "Detecting duplicates..."
-        detect_and_store_duplicates(files)
+        scan.update(progress_message="Detecting duplicates...")
+        scan.duplicates = await asyncio.to_thread(detect_duplicates, files)
 
-        # Update final status
-        scan_status["progress_message"] = f"Scan complete! Found {len(files)} files."
-        scan_status["files_found"] = len(files)
+        scan.update(files_found=len(files))
+        message = f"Scan complete! Found {len(files)} files."
     
     except Exception as e:
-        scan_status["progress_message"] = f"Error: {str(e)}"
+        message = f"Error: {str(e)}"
     
     finally:
-        scan_status["is_scanning"] = False
+        scan.update(is_scanning=False, progress_message=message)
 
 
-def detect_and_store_duplicates(files_data: list):
+def detect_duplicates(files_data: list) -> dict:
     """
-    Run duplicate detection on scanned files and store results globally.
+    Run duplicate detection on scanned files.
 
     Args:
-        files_data (list): List of file metadata dictionaries
-    """
-    global duplicate_results
+        files_data (list): List of FileRecords
 
-    groups = find_duplicates(files_data)
-    wasted = calculate_wasted_space(files_data)
+    Returns:
+        dict: 'groups', 'total_duplicate_files' and 'wasted_space_bytes'
+    """
+    groups = group_duplicate_records(files_data)
 
     # Build rich group info (file name + path for each file in group)
     rich_groups = []
-    for group_paths in groups:
+    for group in groups:
         group_files = []
-        for path in group_paths:
+        for f in group:
             group_files.append({
-                "name": os.path.basename(path),
-                "path": path
+                "name": f.name,
+                "path": f.path
             })
-        # Get size of one file from metadata
-        size = 0
-        for f in files_data:
-            if f.get("path") == group_paths[0]:
-                size = f.get("size", 0)
-                break
+        # All files in a group have the same size
+        size = group[0].size
         rich_groups.append({
             "files": group_files,
             "count": len(group_files),
@@ -206,8 +323,9 @@ def detect_and_store_duplicates(files_data: list):
         })
 
     total_dup_files = sum(g["count"] for g in rich_groups)
+    wasted = sum(g["saveable_bytes"] for g in rich_groups)
 
-    duplicate_results = {
+    return {
         "groups": rich_groups,
         "total_duplicate_files": total_dup_files,
         "wasted_space_bytes": wasted
@@ -215,47 +333,15 @@ def detect_and_store_duplicates(files_data: list):
 
 
 @app.route('/api/duplicates', methods=['GET'])
-def get_duplicates():
-    """API endpoint to get duplicate file results."""
-    return jsonify(duplicate_results)
-
-
-def save_index_to_json(files_data: list):
-    """
-    Save the file index to a JSON file.
-    
-    Args:
-        files_data (list): List of file information dictionaries
-    """
-    # Ensure the directory exists
-    os.makedirs(os.path.dirname(config.INDEX_FILE_PATH), exist_ok=True)
-    
-    # Create the index structure
-    index_data = {
-        "total_files": len(files_data),
-        "files": files_data
-    }
-    
-    # Save to JSON
-    with open(config.INDEX_FILE_PATH, 'w', encoding='utf-8') as f:
-        json.dump(index_data, f, indent=2, ensure_ascii=False)
-
-
-def format_size(size_bytes: int) -> str:
+async def get_duplicates():
     """
-    Format file size in human-readable format.
-    
-    Args:
-        size_bytes (int): Size in bytes
-        
-    Returns:
-        str: Formatted size string
+    API endpoint to get duplicate file results of a scan.
+    Accepts an optional 'scan_id' query parameter; defaults to the latest scan.
     """
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.2f} PB"
+    scan = get_scan()
+    if scan is None:
+        return jsonify(NO_DUPLICATES)
+    return jsonify(scan.duplicates)
 
 
 # Register the format_size filter for templates